@@ -25,8 +25,21 @@ Fixes: VIP logic only generates for actual DNAT (dest translation changes).
 import io
 import re
 from collections import defaultdict
+from functools import lru_cache
 from .base import BaseGenerator
 
+# Jumlah bit '1' untuk setiap nilai oktet 0-255 (lookup table untuk konversi netmask)
+_POPCOUNT = bytes(bin(i).count('1') for i in range(256))
+
+
+@lru_cache(maxsize=512)
+def _mask_to_cidr_cached(mask):
+    """Konversi netmask ke panjang CIDR (int); 0 jika netmask tidak valid."""
+    try:
+        return sum(_POPCOUNT[int(x)] for x in mask.split('.'))
+    except (ValueError, IndexError):
+        return 0
+
 
 class FortinetGenerator(BaseGenerator):
     # Definisi Service Default Fortinet (Protocol, Port/Type)
@@ -119,10 +132,7 @@ class FortinetGenerator(BaseGenerator):
 
     def _mask_to_cidr(self, mask):
         if not mask: return 0
-        try:
-            return sum([bin(int(x)).count('1') for x in mask.split('.')])
-        except:
-            return 0
+        return _mask_to_cidr_cached(mask)
 
     def _get_network_broadcast(self, ip_str, mask_or_cidr):
         try:
@@ -313,10 +313,7 @@ class PaloAltoSetGenerator(BaseGenerator):
                 # Create physical interface config
                 # In Palo Alto, physical interfaces are added to aggregate group
                 # We add them to physical_interfaces list but mark them as part of aggregate
-                phys_iface = Interface(name=m, description=f"Member of {name}")
-                # We need a way to store the aggregate group association
-                # Using a temporary attribute
-                phys_iface.aggregate_group = name
+                phys_iface = Interface(name=m, description=f"Member of {name}", aggregate_group=name)
                 physical_interfaces.append(phys_iface)
 
         for iface in self.config.interfaces:
@@ -784,10 +781,10 @@ class PaloAltoSetGenerator(BaseGenerator):
         for grp in sorted(self.config.address_groups, key=lambda x: x.name):
             clean_grp_name = self._sanitize_name(grp.name)
             name = f'"{clean_grp_name}"'
-            members_list = [f'"{self._sanitize_name(m)}"' for m in sorted(list(grp.members))]
-            if members_list:
-                members_str = " ".join(members_list)
-                f.write(f"{pfx} address-group {name} static [ {members_str} ]\n")
+            sanitized = [self._sanitize_name(m) for m in sorted(grp.members)]
+            if sanitized:
+                members_str = '[ "' + '" "'.join(sanitized) + '" ]'
+                f.write(f"{pfx} address-group {name} static {members_str}\n")
         f.write("\n")
 
     def _generate_service_groups(self, f):
@@ -800,10 +797,10 @@ class PaloAltoSetGenerator(BaseGenerator):
         for grp in sorted(self.config.service_groups, key=lambda x: x.name):
             clean_grp_name = self._sanitize_name(grp.name)
             name = f'"{clean_grp_name}"'
-            members_list = [f'"{self._sanitize_name(m)}"' for m in sorted(list(grp.members))]
-            if members_list:
-                members_str = " ".join(members_list)
-                f.write(f"{pfx} service-group {name} members [ {members_str} ]\n")
+            sanitized = [self._sanitize_name(m) for m in sorted(grp.members)]
+            if sanitized:
+                members_str = '[ "' + '" "'.join(sanitized) + '" ]'
+                f.write(f"{pfx} service-group {name} members {members_str}\n")
         f.write("\n")
 
     def _generate_rules(self, f):
@@ -915,8 +912,8 @@ class PaloAltoSetGenerator(BaseGenerator):
                 if not src_list or any(s.lower() in ['any', 'all'] for s in src_list):
                     src_members_str = "any"
                 else:
-                    members = " ".join([f'"{self._sanitize_name(m)}"' for m in src_list])
-                    src_members_str = f"[ {members} ]"
+                    sanitized = [self._sanitize_name(m) for m in src_list]
+                    src_members_str = '[ "' + '" "'.join(sanitized) + '" ]'
                 f.write(f"{base_cmd} source {src_members_str}\n")
 
                 # --- Destination ---
@@ -939,8 +936,8 @@ class PaloAltoSetGenerator(BaseGenerator):
                 if not dst_list or any(d.lower() in ['any', 'all'] for d in dst_list):
                     dst_members_str = "any"
                 else:
-                    members = " ".join([f'"{self._sanitize_name(m)}"' for m in dst_list])
-                    dst_members_str = f"[ {members} ]"
+                    sanitized = [self._sanitize_name(m) for m in dst_list]
+                    dst_members_str = '[ "' + '" "'.join(sanitized) + '" ]'
                 f.write(f"{base_cmd} destination {dst_members_str}\n")
 
                 # --- PAN-OS 11+ DEFAULT PARAMETERS ---
@@ -978,8 +975,9 @@ class PaloAltoSetGenerator(BaseGenerator):
                         if not svc_list_filtered:
                             f.write(f"{base_cmd} service application-default\n")
                         else:
-                            members = " ".join([f'"{self._sanitize_name(s)}"' for s in svc_list_filtered])
-                            f.write(f"{base_cmd} service [ {members} ]\n")
+                            sanitized = [self._sanitize_name(s) for s in svc_list_filtered]
+                            members_str = '[ "' + '" "'.join(sanitized) + '" ]'
+                            f.write(f"{base_cmd} service {members_str}\n")
 
                 # --- HIP Profiles ---
                 f.write(f"{base_cmd} source-hip any\n")
@@ -1039,8 +1037,8 @@ class PaloAltoSetGenerator(BaseGenerator):
             if not src_list or any(s.lower() in ['any', 'all'] for s in src_list):
                 src_members_str = "[ any ]"
             else:
-                members = " ".join([f'"{self._sanitize_name(m)}"' for m in src_list])
-                src_members_str = f"[ {members} ]"
+                sanitized = [self._sanitize_name(m) for m in src_list]
+                src_members_str = '[ "' + '" "'.join(sanitized) + '" ]'
             f.write(f"{base_cmd} source {src_members_str}\n")
 
             dst_list = sorted(list(rule.original_destination))
@@ -1048,8 +1046,8 @@ class PaloAltoSetGenerator(BaseGenerator):
             if not dst_list or any(d.lower() in ['any', 'all'] for d in dst_list):
                 dst_members_str = "[ any ]"
             else:
-                members = " ".join([f'"{self._sanitize_name(m)}"' for m in dst_list])
-                dst_members_str = f"[ {members} ]"
+                sanitized = [self._sanitize_name(m) for m in dst_list]
+                dst_members_str = '[ "' + '" "'.join(sanitized) + '" ]'
             f.write(f"{base_cmd} destination {dst_members_str}\n")
 
             # [FIXED] Force 'service any' for ICMP/Traceroute in NAT
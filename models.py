@@ -2,11 +2,98 @@
 """
 File ini berisi semua model data (dataclasses) yang digunakan di seluruh aplikasi.
 Model-model ini berfungsi sebagai struktur data netral (Hub) dalam arsitektur Hub-and-Spoke.
+Semua model memakai __slots__ (dataclass slots=True) agar hemat memori untuk konfigurasi besar,
+sehingga atribut baru harus dideklarasikan sebagai field, bukan ditambahkan secara dinamis.
+Objek bernama (Address, Service, Group, dll.) dibandingkan hanya berdasarkan nama, konsisten dengan __hash__.
 """
 from dataclasses import dataclass, field
 from typing import List, Set, Optional, Dict
 
-@dataclass
+
+class NamedSet(set):
+    """
+    Set untuk objek bernama (Address, Service, Group, Interface, dll.) yang juga menyimpan
+    indeks nama -> objek, sehingga parser bisa mencari objek berdasarkan nama dalam O(1)
+    lewat get(name) alih-alih memindai seluruh set.
+    Tetap subclass dari set, jadi iterasi, operator set, dan pemanggil lama tidak berubah.
+    Berbeda dengan set biasa, add()/update() dengan nama yang sudah ada mengganti objek lama
+    (definisi terakhir yang berlaku, seperti di perangkat), baik di set maupun di indeks.
+    """
+    __slots__ = ('_by_name',)
+
+    def __init__(self, iterable=()):
+        super().__init__()
+        self._by_name = {}
+        self.update(iterable)
+
+    def get(self, name, default=None):
+        return self._by_name.get(name, default)
+
+    def add(self, obj):
+        if obj.name in self._by_name:
+            # Objek sama nama dianggap sama (lihat __eq__), jadi yang lama harus dibuang dulu
+            set.discard(self, obj)
+        self._by_name[obj.name] = obj
+        set.add(self, obj)
+
+    def update(self, *iterables):
+        for iterable in iterables:
+            # Dict nama -> objek: kemunculan terakhir tiap nama yang dipakai
+            latest = {obj.name: obj for obj in iterable}
+            objs = latest.values()
+            set.difference_update(self, objs)
+            set.update(self, objs)
+            self._by_name.update(latest)
+
+    def remove(self, obj):
+        set.remove(self, obj)
+        del self._by_name[obj.name]
+
+    def discard(self, obj):
+        if obj in self:
+            self.remove(obj)
+
+    def pop(self):
+        obj = set.pop(self)
+        del self._by_name[obj.name]
+        return obj
+
+    def clear(self):
+        set.clear(self)
+        self._by_name.clear()
+
+    def difference_update(self, *iterables):
+        for iterable in iterables:
+            for obj in iterable:
+                self.discard(obj)
+
+    def intersection_update(self, *iterables):
+        keep = set(self).intersection(*iterables)
+        self.clear()
+        self.update(keep)
+
+    def symmetric_difference_update(self, iterable):
+        result = set(self).symmetric_difference(iterable)
+        self.clear()
+        self.update(result)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+@dataclass(slots=True, eq=False)
 class Interface:
     """Mewakili satu interface fisik atau logis (VLAN/subinterface)."""
     name: str
@@ -15,11 +102,17 @@ class Interface:
     mask_length: Optional[int] = None
     description: Optional[str] = None
     vlan_id: Optional[int] = None
+    aggregate_group: Optional[str] = None  # Target aggregate (LACP) group this member belongs to
 
     def __hash__(self):
         return hash(self.name)
 
-@dataclass
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self.name == other.name
+        return NotImplemented
+
+@dataclass(slots=True, eq=False)
 class Address:
     """Mewakili objek alamat (host, network, atau range)."""
     name: str
@@ -31,7 +124,12 @@ class Address:
     def __hash__(self):
         return hash(self.name)
 
-@dataclass
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self.name == other.name
+        return NotImplemented
+
+@dataclass(slots=True, eq=False)
 class Service:
     """Mewakili objek service (TCP, UDP, ICMP, dll.)."""
     name: str
@@ -42,7 +140,12 @@ class Service:
     def __hash__(self):
         return hash(self.name)
 
-@dataclass
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self.name == other.name
+        return NotImplemented
+
+@dataclass(slots=True, eq=False)
 class Group:
     """Mewakili grup alamat (address group)."""
     name: str
@@ -52,7 +155,12 @@ class Group:
     def __hash__(self):
         return hash(self.name)
 
-@dataclass
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self.name == other.name
+        return NotImplemented
+
+@dataclass(slots=True, eq=False)
 class ServiceGroup:
     """Mewakili grup service (service group)."""
     name: str
@@ -62,7 +170,12 @@ class ServiceGroup:
     def __hash__(self):
         return hash(self.name)
 
-@dataclass
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self.name == other.name
+        return NotImplemented
+
+@dataclass(slots=True, eq=False)
 class TimeRange:
     """Mewakili objek jadwal/waktu."""
     name: str
@@ -75,7 +188,12 @@ class TimeRange:
     def __hash__(self):
         return hash(self.name)
 
-@dataclass
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self.name == other.name
+        return NotImplemented
+
+@dataclass(slots=True, eq=False)
 class SecurityProfile:
     """Mewakili satu profil keamanan (IPS, AV, Web Filter, dll.)."""
     name: str
@@ -85,7 +203,12 @@ class SecurityProfile:
     def __hash__(self):
         return hash(self.name)
 
-@dataclass
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self.name == other.name
+        return NotImplemented
+
+@dataclass(slots=True)
 class StaticRoute:
     """Mewakili satu baris rute statis."""
     destination: str
@@ -96,7 +219,7 @@ class StaticRoute:
     route_type: str = "static"  # static, ospf, bgp, eigrp, rip
     comment: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Rule:
     """Mewakili satu baris aturan firewall (policy)."""
     sequence_id: int
@@ -118,7 +241,7 @@ class Rule:
     vdom: str = None
     original_text: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class NatRule:
     """Mewakili satu baris aturan NAT."""
     sequence_id: int
@@ -135,7 +258,7 @@ class NatRule:
     remark: str = None
     original_text: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class ConversionWarning:
     """Mewakili pesan peringatan atau error konversi."""
     category: str  # e.g., 'Parser', 'Generator', 'Unsupported'
@@ -146,18 +269,18 @@ class ConversionWarning:
     severity: str = "warning" # warning, error, info
     details: List[str] = field(default_factory=list) # [NEW] Stores detailed content (e.g. block content)
 
-@dataclass
+@dataclass(slots=True)
 class FirewallConfig:
     """Kontainer utama yang menampung seluruh konfigurasi yang telah diparse."""
-    addresses: Set[Address] = field(default_factory=set)
-    services: Set[Service] = field(default_factory=set)
-    address_groups: Set[Group] = field(default_factory=set)
-    service_groups: Set[ServiceGroup] = field(default_factory=set)
-    time_ranges: Set[TimeRange] = field(default_factory=set)
+    addresses: Set[Address] = field(default_factory=NamedSet)
+    services: Set[Service] = field(default_factory=NamedSet)
+    address_groups: Set[Group] = field(default_factory=NamedSet)
+    service_groups: Set[ServiceGroup] = field(default_factory=NamedSet)
+    time_ranges: Set[TimeRange] = field(default_factory=NamedSet)
     rules: List[Rule] = field(default_factory=list)
-    interfaces: Set[Interface] = field(default_factory=set)
+    interfaces: Set[Interface] = field(default_factory=NamedSet)
     nat_rules: List[NatRule] = field(default_factory=list)
-    security_profiles: Set[SecurityProfile] = field(default_factory=set)
+    security_profiles: Set[SecurityProfile] = field(default_factory=NamedSet)
     static_routes: List[StaticRoute] = field(default_factory=list)
     # Field baru untuk menyimpan raw config OSPF/BGP
     dynamic_routing_config: str = ""
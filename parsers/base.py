@@ -1,19 +1,63 @@
 # parsers/base.py
 import re
+import sys
+from functools import lru_cache
+
 from models import FirewallConfig
 
+# Jumlah bit '1' untuk setiap nilai oktet 0-255 (lookup table untuk konversi netmask)
+_POPCOUNT = bytes(bin(i).count('1') for i in range(256))
+
+
+@lru_cache(maxsize=512)
+def _mask_to_cidr_cached(mask: str) -> str:
+    """Konversi netmask ke CIDR; di-cache karena konfigurasi memakai ulang segelintir netmask yang sama."""
+    if not mask or '.' not in mask:
+        return "32"
+    parts = mask.split('.')
+    try:
+        if len(parts) == 4:
+            return str(_POPCOUNT[int(parts[0])] + _POPCOUNT[int(parts[1])] +
+                       _POPCOUNT[int(parts[2])] + _POPCOUNT[int(parts[3])])
+        return str(sum(_POPCOUNT[int(x)] for x in parts))
+    except (ValueError, IndexError):
+        return "32"
+
+
 class BaseParser:
     """Kelas dasar untuk semua parser."""
     _RE_IS_MASK = re.compile(r"^\d{1,3}(\.\d{1,3}){3}$")
+    _RULE_MEMBER_FIELDS = ('source_interface', 'destination_interface', 'source', 'destination', 'service',
+                           'application')
+    _NAT_MEMBER_FIELDS = ('source_interface', 'destination_interface', 'original_source', 'original_destination',
+                          'original_service')
 
     def parse(self, **kwargs) -> FirewallConfig:
         raise NotImplementedError
 
     def _mask_to_cidr(self, mask: str) -> str:
         """Mengonversi netmask (255.255.255.0) ke panjang CIDR (24)."""
-        if not mask or '.' not in mask:
-            return "32"
-        try:
-            return str(sum(bin(int(x)).count('1') for x in mask.split('.')))
-        except (ValueError, IndexError):
-            return "32"
+        return _mask_to_cidr_cached(mask)
+
+    def _freeze_members(self, config: FirewallConfig) -> FirewallConfig:
+        """
+        Mengubah field set pada Rule/NatRule dan member Group/ServiceGroup menjadi frozenset
+        setelah parsing selesai. Setelah parse, member hanya dibaca oleh generator, jadi cukup
+        disimpan read-only. Nama member grup di-intern agar nama yang sama (mis. 'any' atau
+        objek yang dipakai banyak grup) hanya disimpan satu kali di memori.
+        """
+        for group in config.address_groups:
+            group.members = frozenset(map(sys.intern, group.members))
+        for group in config.service_groups:
+            group.members = frozenset(map(sys.intern, group.members))
+        for rule in config.rules:
+            for field_name in self._RULE_MEMBER_FIELDS:
+                value = getattr(rule, field_name)
+                if isinstance(value, set):
+                    setattr(rule, field_name, frozenset(value))
+        for nat_rule in config.nat_rules:
+            for field_name in self._NAT_MEMBER_FIELDS:
+                value = getattr(nat_rule, field_name)
+                if isinstance(value, set):
+                    setattr(nat_rule, field_name, frozenset(value))
+        return config
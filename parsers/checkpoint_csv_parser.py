@@ -4,9 +4,25 @@ Checkpoint CSV Parser - Parses CSV exports from SmartConsole.
 """
 import csv
 import io
+import logging
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import islice
+from operator import itemgetter
 
 from models import Address, Group, Service, ServiceGroup, FirewallConfig
 
+# pyarrow is optional: when installed, CSV tokenizing runs in C and columns are
+# materialized in bulk. Without it we fall back to the stdlib csv module.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = pa_csv = None
+
+logger = logging.getLogger(__name__)
+
 
 class CheckpointCSVParser:
     """
@@ -19,140 +35,331 @@ class CheckpointCSVParser:
     - *add-service-tcp*.csv
     - *add-service-udp*.csv
     - *add-service-group*.csv
+
+    Every parse_* method accepts the CSV as decoded text (str), raw bytes,
+    a file path (os.PathLike) or an already opened file object (text or binary).
+    Paths and binary streams are decoded incrementally through a 64KB buffer, so
+    peak memory stays at one buffer plus one row regardless of the export size.
     """
+    READ_BUFFER_SIZE = 1 << 16
+
+    def _open_source(self, source):
+        """
+        Returns (text_stream, release) for the given CSV source.
+        Paths are opened with a 64KB buffer and bytes are decoded incrementally,
+        so the caller never has to hold a fully decoded copy of the file.
+        'release' is called once reading is done (None when there is nothing to do):
+        it closes streams we opened and detaches from binary streams the caller owns.
+        Callers must call it deterministically (see _get_reader), not leave it to
+        garbage collection: a TextIOWrapper that is collected without being detached
+        closes the caller's binary stream.
+        """
+        if source is None:
+            # Missing export (e.g. file not present in the ZIP) parses as empty
+            stream = io.StringIO()
+            return stream, stream.close
+        if isinstance(source, str):
+            stream = io.StringIO(source)
+            return stream, stream.close
+        if isinstance(source, (bytes, bytearray)):
+            stream = io.TextIOWrapper(io.BytesIO(source), encoding='utf-8-sig', newline='')
+            return stream, stream.close
+        if isinstance(source, os.PathLike):
+            stream = open(source, 'r', encoding='utf-8-sig', newline='', buffering=self.READ_BUFFER_SIZE)
+            return stream, stream.close
+        if isinstance(source, (io.RawIOBase, io.BufferedIOBase)):
+            # Binary file object (e.g. ZipFile.open()): decode on the fly, leave it open for the caller
+            stream = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+            return stream, stream.detach
+        return source, None
 
-    def _get_reader(self, content: str):
+    @contextmanager
+    def _get_reader(self, source):
         """
-        Returns a DictReader with normalized headers (lowercase, stripped).
+        Context manager yielding (row_iterator, header_index_map) with normalized
+        headers (lowercase, stripped). The index map lets parsers look up column
+        positions once per file instead of building a dict for every row.
+        The underlying stream is released when the with-block exits, including early
+        returns (e.g. a header without the needed columns) and exceptions, whether or
+        not the rows were consumed.
         """
-        # Read content to list of lines to handle headers manually
-        f = io.StringIO(content)
+        if pa_csv is not None and isinstance(source, (str, bytes, bytearray)):
+            result = self._read_table(source)
+            if result is not None:
+                yield result
+                return
+
+        stream, release = self._open_source(source)
         try:
-            # Read first line for headers
-            header_line = next(csv.reader(f))
-            # Normalize headers: strip whitespace and convert to lower case
-            fieldnames = [h.strip().lower() for h in header_line]
-            
-            # Create DictReader with explicit fieldnames
-            # We don't verify fieldnames here, just use them.
-            # DictReader will consume subsequent lines as data.
-            return csv.DictReader(f, fieldnames=fieldnames)
-        except StopIteration:
-            # Empty file
-            return []
-
-    def parse_hosts(self, content: str, config: FirewallConfig):
+            reader = csv.reader(stream)
+            # Read first line for headers; an empty file has none
+            header_line = next(reader, None)
+            if header_line is None:
+                yield iter(()), {}
+            else:
+                # Normalize headers: strip whitespace and convert to lower case
+                yield reader, {h.strip().lower(): i for i, h in enumerate(header_line)}
+        finally:
+            if release is not None:
+                release()
+
+    def _read_table(self, content):
+        """
+        Parses in-memory CSV (str or bytes) with pyarrow and returns
+        (row_iterator, header_index_map), or None when pyarrow cannot handle it.
+        """
+        result = self._read_columns(content)
+        if result is None:
+            return None
+        columns, idx = result
+        return zip(*columns), idx
+
+    def _read_columns(self, content):
+        """
+        Parses in-memory CSV (str or bytes) with pyarrow and returns
+        (columns, header_index_map) where columns[i] is the list of values of
+        column i, or None when pyarrow cannot handle the file (ragged rows,
+        empty input, ...).
+        All columns are read as strings so values match the csv module output.
+        """
+        if isinstance(content, str):
+            data = content.encode('utf-8')
+            end = content.find('\n')
+            first_line = content if end == -1 else content[:end]
+        else:
+            data = bytes(content)
+            end = data.find(b'\n')
+            first_line = (data if end == -1 else data[:end]).decode('utf-8-sig', errors='replace')
+        header_line = next(csv.reader([first_line.rstrip('\r')]), None)
+        if not header_line:
+            return None
+        try:
+            table = pa_csv.read_csv(
+                pa.py_buffer(data),
+                read_options=pa_csv.ReadOptions(column_names=[str(i) for i in range(len(header_line))],
+                                                skip_rows=1),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={str(i): pa.string() for i in range(len(header_line))},
+                    strings_can_be_null=False),
+            )
+        except (pa.ArrowInvalid, ValueError):
+            return None
+        idx = {h.strip().lower(): i for i, h in enumerate(header_line)}
+        return [col.to_pylist() for col in table.columns], idx
+
+    @staticmethod
+    def _member_columns(idx) -> list:
+        """Returns the positions of the indexed members.N columns, in file order."""
+        return sorted(i for h, i in idx.items() if h.startswith('members.'))
+
+    @staticmethod
+    def _row_getter(idx, *columns):
+        """
+        Returns (getter, min_row_len) that unpacks the given columns from a row in one
+        C-level call, or (None, 0) when any column is absent from the header (in which
+        case no row can satisfy the parser).
+        """
+        positions = [idx.get(c) for c in columns]
+        if None in positions:
+            return None, 0
+        return itemgetter(*positions), max(positions) + 1
+
+    # The per-row loops below build Address/Service positionally
+    # (name, type/protocol, value...): on slotted dataclasses that is about twice
+    # as fast as passing keyword arguments.
+
+    def parse_hosts(self, content, config: FirewallConfig):
         """Parse host objects from CSV."""
-        reader = self._get_reader(content)
-        for row in reader:
-            name = row.get('name', '').strip()
-            ip_addr = row.get('ipv4-address', '').strip()
-            if name and ip_addr:
-                # Host = /32 mask
-                config.addresses.add(Address(name=name, type='host', value1=ip_addr, value2='32'))
-
-    def parse_networks(self, content: str, config: FirewallConfig):
+        with self._get_reader(content) as (reader, idx):
+            get, min_len = self._row_getter(idx, 'name', 'ipv4-address')
+            if get is None:
+                return
+            parsed = []
+            for row in reader:
+                if len(row) < min_len:
+                    continue
+                name, ip_addr = get(row)
+                name, ip_addr = name.strip(), ip_addr.strip()
+                if name and ip_addr:
+                    # Host = /32 mask
+                    parsed.append(Address(name, 'host', ip_addr, '32'))
+        config.addresses.update(parsed)
+
+    def parse_networks(self, content, config: FirewallConfig):
         """Parse network objects from CSV."""
-        reader = self._get_reader(content)
-        for row in reader:
-            name = row.get('name', '').strip()
-            subnet = row.get('subnet4', '').strip()
-            mask_length = row.get('mask-length4', '').strip()
-            if name and subnet and mask_length:
-                config.addresses.add(Address(name=name, type='network', value1=subnet, value2=mask_length))
-
-    def parse_address_ranges(self, content: str, config: FirewallConfig):
+        with self._get_reader(content) as (reader, idx):
+            get, min_len = self._row_getter(idx, 'name', 'subnet4', 'mask-length4')
+            if get is None:
+                return
+            parsed = []
+            for row in reader:
+                if len(row) < min_len:
+                    continue
+                name, subnet, mask_length = get(row)
+                name, subnet, mask_length = name.strip(), subnet.strip(), mask_length.strip()
+                if name and subnet and mask_length:
+                    parsed.append(Address(name, 'network', subnet, mask_length))
+        config.addresses.update(parsed)
+
+    def parse_address_ranges(self, content, config: FirewallConfig):
         """Parse address range objects from CSV."""
-        reader = self._get_reader(content)
-        for row in reader:
-            name = row.get('name', '').strip()
-            ip_first = row.get('ipv4-address-first', '').strip()
-            ip_last = row.get('ipv4-address-last', '').strip()
-            if name and ip_first and ip_last:
-                config.addresses.add(Address(name=name, type='range', value1=ip_first, value2=ip_last))
+        with self._get_reader(content) as (reader, idx):
+            get, min_len = self._row_getter(idx, 'name', 'ipv4-address-first', 'ipv4-address-last')
+            if get is None:
+                return
+            parsed = []
+            for row in reader:
+                if len(row) < min_len:
+                    continue
+                name, ip_first, ip_last = get(row)
+                name, ip_first, ip_last = name.strip(), ip_first.strip(), ip_last.strip()
+                if name and ip_first and ip_last:
+                    parsed.append(Address(name, 'range', ip_first, ip_last))
+        config.addresses.update(parsed)
 
-    def parse_groups(self, content: str, config: FirewallConfig):
+    def _collect_group_members(self, source):
         """
-        Parse address group objects from CSV.
-        CheckPoint exports use indexed columns: members.0, members.1, members.2, etc.
+        Builds {group_name: set(members)} from a group export, merging the indexed
+        members.0, members.1, ... columns. Returns (group_map, row_count).
+        With pyarrow the file is read column by column, so no per-row tuples are built.
         """
-        reader = self._get_reader(content)
-        group_map = {}  # name -> set of members
-        
-        print(f"[DEBUG] Parsing group CSV...")
-        row_count = 0
+        if pa_csv is not None and isinstance(source, (str, bytes, bytearray)):
+            result = self._read_columns(source)
+            if result is not None:
+                return self._group_members_from_columns(*result)
+
+        with self._get_reader(source) as (reader, idx):
+            ni = idx.get('name')
+            members_idx = self._member_columns(idx)
+            group_map = defaultdict(set)  # name -> set of members
+            intern_cache = {}  # member -> canonical str, so repeated members share one object
+            if ni is None:
+                # No name column: nothing can be grouped, just count the rows
+                return group_map, sum(1 for _ in reader)
+            row_count = 0
         
-        for row in reader:
-            row_count += 1
-            name = row.get('name', '').strip()
+            for row in reader:
+                row_count += 1
+                # Blank/footer rows are common in exports; test the raw cell before stripping
+                if len(row) <= ni:
+                    continue
+                name = row[ni]
+                if not name:
+                    continue
+                if name[0].isspace() or name[-1].isspace():
+                    name = name.strip()
+                    if not name:
+                        continue
             
-            if not name:
-                continue
+                # Single lookup creates the group on first sight (even with no members)
+                members = group_map[name]
             
-            # Initialize group if new
-            if name not in group_map:
+                # Collect members from indexed columns (members.0, members.1, members.2, ...)
+                row_len = len(row)
+                for i in members_idx:
+                    if i >= row_len:
+                        break
+                    value = row[i]
+                    if not value:
+                        continue
+                    # Only strip padded cells; clean exports skip the extra allocation
+                    if value[0].isspace() or value[-1].isspace():
+                        value = value.strip()
+                        if not value:
+                            continue
+                    members.add(intern_cache.setdefault(value, value))
+        
+            return group_map, row_count
+
+    def _group_members_from_columns(self, columns, idx):
+        """Columnar variant of _collect_group_members: walks each members.N column once."""
+        ni = idx.get('name')
+        row_count = len(columns[0]) if columns else 0
+        if ni is None:
+            return {}, row_count
+        intern_cache = {}
+        
+        # First pass over the name column: every group is known before any member is
+        # read, so create them all up front (file order, even without members) and
+        # resolve each row to its member set once instead of per cell.
+        names = [name.strip() for name in columns[ni]]
+        group_map = {}
+        for name in names:
+            if name and name not in group_map:
                 group_map[name] = set()
-            
-            # Collect members from indexed columns (members.0, members.1, members.2, ...)
-            for key, value in row.items():
-                if key.startswith('members.') and value and value.strip():
-                    group_map[name].add(value.strip())
+        row_sets = [group_map.get(name) for name in names]  # None for unnamed rows
         
-        # Convert map to Group objects
-        for group_name, members in group_map.items():
-            config.address_groups.add(Group(name=group_name, members=members))
+        for i in self._member_columns(idx):
+            for members, value in zip(row_sets, columns[i]):
+                if members is None or not value:
+                    continue
+                if value[0].isspace() or value[-1].isspace():
+                    value = value.strip()
+                    if not value:
+                        continue
+                members.add(intern_cache.setdefault(value, value))
         
-        print(f"[DEBUG] Parsed {len(group_map)} groups from {row_count} rows")
-        # Print all groups with member counts
-        for name, members in group_map.items():
-            print(f"[DEBUG]   Group '{name}': {len(members)} members")
-            if len(members) > 0:
-                # Show first 3 members as sample
-                sample = list(members)[:3]
-                print(f"[DEBUG]     Sample members: {sample}")
+        return group_map, row_count
 
+    def parse_groups(self, content, config: FirewallConfig):
+        """
+        Parse address group objects from CSV.
+        CheckPoint exports use indexed columns: members.0, members.1, members.2, etc.
+        """
+        logger.debug("Parsing group CSV...")
+        group_map, row_count = self._collect_group_members(content)
+        
+        # Convert map to Group objects
+        config.address_groups.update(
+            Group(name=group_name, members=members) for group_name, members in group_map.items())
+        
+        logger.debug("Parsed %d groups from %d rows", len(group_map), row_count)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Log all groups with member counts and a small sample
+            for name, members in group_map.items():
+                logger.debug("  Group '%s': %d members", name, len(members))
+                if members:
+                    logger.debug("    Sample members: %s", list(islice(members, 3)))
 
-    def parse_tcp_services(self, content: str, config: FirewallConfig):
+    def parse_tcp_services(self, content, config: FirewallConfig):
         """Parse TCP service objects from CSV."""
-        reader = self._get_reader(content)
-        for row in reader:
-            name = row.get('name', '').strip()
-            port = row.get('port', '').strip()
-            if name and port:
-                config.services.add(Service(name=name, protocol='tcp', port=f'eq {port}'))
-
-    def parse_udp_services(self, content: str, config: FirewallConfig):
+        with self._get_reader(content) as (reader, idx):
+            get, min_len = self._row_getter(idx, 'name', 'port')
+            if get is None:
+                return
+            parsed = []
+            for row in reader:
+                if len(row) < min_len:
+                    continue
+                name, port = get(row)
+                name, port = name.strip(), port.strip()
+                if name and port:
+                    parsed.append(Service(name, 'tcp', f'eq {port}'))
+        config.services.update(parsed)
+
+    def parse_udp_services(self, content, config: FirewallConfig):
         """Parse UDP service objects from CSV."""
-        reader = self._get_reader(content)
-        for row in reader:
-            name = row.get('name', '').strip()
-            port = row.get('port', '').strip()
-            if name and port:
-                config.services.add(Service(name=name, protocol='udp', port=f'eq {port}'))
+        with self._get_reader(content) as (reader, idx):
+            get, min_len = self._row_getter(idx, 'name', 'port')
+            if get is None:
+                return
+            parsed = []
+            for row in reader:
+                if len(row) < min_len:
+                    continue
+                name, port = get(row)
+                name, port = name.strip(), port.strip()
+                if name and port:
+                    parsed.append(Service(name, 'udp', f'eq {port}'))
+        config.services.update(parsed)
 
-    def parse_service_groups(self, content: str, config: FirewallConfig):
+    def parse_service_groups(self, content, config: FirewallConfig):
         """
         Parse service group objects from CSV.
         CheckPoint exports use indexed columns: members.0, members.1, members.2, etc.
         """
-        reader = self._get_reader(content)
-        group_map = {}  # name -> set of members
-        
-        for row in reader:
-            name = row.get('name', '').strip()
-            
-            if not name:
-                continue
-            
-            # Initialize group if new
-            if name not in group_map:
-                group_map[name] = set()
-            
-            # Collect members from indexed columns (members.0, members.1, members.2, ...)
-            for key, value in row.items():
-                if key.startswith('members.') and value and value.strip():
-                    group_map[name].add(value.strip())
+        group_map, _ = self._collect_group_members(content)
         
         # Convert map to ServiceGroup objects
-        for group_name, members in group_map.items():
-            config.service_groups.add(ServiceGroup(name=group_name, members=members))
+        config.service_groups.update(
+            ServiceGroup(name=group_name, members=members) for group_name, members in group_map.items())
@@ -7,13 +7,31 @@ FIXED: Added support for 'group-object' inside service-groups to handle nested g
 FIXED: Added support for FQDN objects.
 UPDATED: Added Conversion Warning collection for unparsed lines.
 """
+import logging
 import re
-from typing import List, Set, Dict
+import sys
+from dataclasses import dataclass
+from typing import List, Set, Optional
 
 from models import FirewallConfig, Address, Group, Service, ServiceGroup, Rule, TimeRange, NatRule, StaticRoute, \
     Interface, ConversionWarning
 from .base import BaseParser
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _ParseState:
+    """State yang dibawa antar handler baris selama satu parse (counter dan baris konteks aktif)."""
+    config: FirewallConfig
+    duplicates: Set[str]
+    lines: List[str]
+    lines_lower: List[str]
+    context_name: str = 'default'
+    rule_seq: int = 1
+    nat_seq: int = 1
+    last_remark: Optional[str] = None
+
 
 class CiscoAsaParser(BaseParser):
     """Parser untuk konfigurasi Cisco ASA dengan dukungan pembersihan log PuTTY."""
@@ -30,10 +48,16 @@ class CiscoAsaParser(BaseParser):
     _RE_OBJ_NAT = re.compile(
         r'nat \((.+?),(.+?)\) (dynamic|static) (\S+)(?: service (\S+) (\S+) (\S+))?(?: unidirectional)?')
 
-    _RE_MANUAL_TWICE_NAT = re.compile(r'nat \((.+?),(.+?)\).*source static (\S+) (\S+) destination static (\S+) (\S+)')
-    _RE_MANUAL_STATIC_NAT = re.compile(r'nat \((.+?),(.+?)\).*source static (\S+) (\S+?)( unidirectional)?$')
-    _RE_MANUAL_DYNAMIC_PAT = re.compile(r'nat \((.+?),(.+?)\).*source dynamic (\S+) interface')
-    _RE_MANUAL_DYNAMIC_NAT = re.compile(r'nat \((.+?),(.+?)\).*source dynamic (\S+) (\S+)')
+    # Manual NAT: twice / static / dynamic PAT / dynamic NAT dalam satu pola. Header 'nat (src,dst)' dicocokkan
+    # sekali, lalu tiap bentuk dicoba sebagai lookahead sesuai urutan prioritas (hasil sama dengan mencoba
+    # empat regex terpisah berurutan).
+    _RE_MANUAL_NAT = re.compile(
+        r'nat \((?P<src_intf>.+?),(?P<dst_intf>.+?)\)(?:'
+        r'(?=.*source static (?P<tw_src>\S+) (?P<tw_mapped_src>\S+) '
+        r'destination static (?P<tw_dst>\S+) (?P<tw_mapped_dst>\S+))'
+        r'|(?=.*source static (?P<st_src>\S+) (?P<st_mapped_src>\S+?)(?P<unidirectional> unidirectional)?$)'
+        r'|(?=.*source dynamic (?P<pat_src>\S+) interface)'
+        r'|(?=.*source dynamic (?P<dyn_src>\S+) (?P<dyn_mapped_src>\S+)))')
     _RE_OBJ_SERVICE = re.compile(r'object service (\S+)')
     _RE_SERVICE_DEF = re.compile(r'service (tcp|udp) destination (eq|range) (.*)')
     _RE_ADDR_GROUP = re.compile(r'object-group network (\S+)')
@@ -42,114 +66,157 @@ class CiscoAsaParser(BaseParser):
     _RE_NET_SUBNET = re.compile(r'network-object (\S+) (\S+)')
     _RE_GROUP_OBJ = re.compile(r'group-object (\S+)')
     _RE_IP_MASK = re.compile(r'\d{1,3}(\.\d{1,3}){3}')
+    # Kata kunci operand alamat ACE -> jumlah token yang dipakai ('any' sendiri, 'host X', 'object X', ...)
+    _ADDR_KEYWORDS = {'any': 1, 'any4': 1, 'host': 2, 'object-group': 2, 'object': 2}
     _RE_SVC_GROUP = re.compile(r'object-group service (\S+)(?: (tcp|udp|tcp-udp))?')
     _RE_SVC_OBJ_OBJ = re.compile(r'service-object object (\S+)')
     _RE_PORT_OBJ = re.compile(r'port-object (eq|range) (.*)')
     _RE_SVC_OBJ_MATCH = re.compile(r'service-object (\S+)(?: destination)? (eq|range) (.*)')
     _RE_SVC_OBJ_PROTO = re.compile(r'service-object (icmp|esp)(?: (echo|echo-reply|traceroute))?$')
     _RE_RULE_TIME_RANGE = re.compile(r'time-range (\S+)')
-    _RE_CLEAN_RULE = re.compile(r'\s+log.*$|\s+inactive$|\s+time-range \S+$')
+    _RE_HIT_COUNT = re.compile(r'\(hitcnt=(\d+)\)')
+    _RE_REMARK_SPLIT = re.compile(r' remark ', re.IGNORECASE)
 
     _RE_INTERFACE_BLOCK = re.compile(r'^interface (\S+)')
+    _RE_ANSI = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+    # Dispatch baris top-level: kata kunci pertama -> (prefix, nama handler). 'time-range' dan 'access-list'
+    # dicocokkan sebagai prefix (tanpa harus diikuti spasi), sama seperti rantai startswith sebelumnya.
+    _RE_KEYWORD = re.compile(r'time-range|access-list|[^ ]*')
+    _LINE_HANDLERS = {
+        'router': (('router ospf', '_on_router_ospf'), ('router bgp', '_on_router_bgp')),
+        'route': (('route ', '_on_static_route'),),
+        'interface': (('interface ', '_on_interface'),),
+        'object': (('object network', '_on_object_network'), ('object service', '_on_object_service')),
+        'object-group': (('object-group network', '_on_address_group'),
+                         ('object-group service', '_on_service_group')),
+        'time-range': (('time-range', '_on_time_range'),),
+        'access-list': (('access-list', '_on_access_list'),),
+        'nat': (('nat (', '_on_nat'),),
+    }
+
+    # Baris yang sengaja diabaikan tanpa ConversionWarning (dicari sebagai substring di mana saja)
+    _RE_NOISE = re.compile(r'hostname|domain-name|names|pager|logging|aaa|ssh|http|console|terminal|crypto|policy-map|'
+                           r'class-map|service-policy')
 
     STOP_TOKENS = ('object', 'access-list', 'hostname', ': end', 'time-range', 'interface ', 'route ', 'router ',
                    'nat ')
 
     def _clean_line(self, line: str) -> str:
         """Membersihkan baris dari ANSI escape codes dan noise PuTTY."""
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        line = ansi_escape.sub('', line)
+        if '\x1b' in line:
+            line = self._RE_ANSI.sub('', line)
         line = line.replace('\xa0', ' ').replace('\t', ' ')
-        return "".join(char for char in line if char.isprintable()).strip()
+        # Sebagian besar baris sudah printable; filter per karakter hanya untuk baris yang tidak
+        if not line.isprintable():
+            line = "".join(char for char in line if char.isprintable())
+        return line.strip()
 
     def parse(self, content: str, **kwargs) -> FirewallConfig:
         config = FirewallConfig()
-        raw_lines = content.splitlines()
-        lines = [self._clean_line(l) for l in raw_lines]
-
-        context_blocks = self._split_into_contexts(lines)
-        duplicates = self._discover_duplicates(context_blocks)
-
-        rule_seq_counter = 1
-        nat_seq_counter = 1
-
-        print(f"DEBUG: Memulai parsing Cisco ASA. Total baris: {len(lines)}")
-
-        for context_name, block_lines in context_blocks.items():
-            last_remark = None
-            i = 0
-            while i < len(block_lines):
-                line = block_lines[i]
-                line_lower = line.lower()
-
-                if not line or line.startswith('!') or line.startswith(':'):
-                    i += 1
-                    continue
-
-                if line_lower.startswith('access-list') and ' remark ' in line_lower:
-                    try:
-                        parts = re.split(r' remark ', line, flags=re.IGNORECASE)
-                        if len(parts) > 1:
-                            last_remark = parts[1].strip()
-                    except IndexError:
-                        pass
-                    i += 1
-                    continue
-
-                # --- Routing (OSPF/BGP/Static) ---
-                if line_lower.startswith('router ospf'):
-                    i = self._parse_router_ospf(i, block_lines, config)
-                elif line_lower.startswith('router bgp'):
-                    i = self._parse_router_bgp(i, block_lines, config)
-                elif line_lower.startswith('route '):
-                    self._parse_static_route(line, config)
-                    i += 1
-
-                # --- Interfaces ---
-                elif line_lower.startswith('interface '):
-                    i = self._parse_interface_block(i, block_lines, config)
-
-                # --- Objects & Groups ---
-                elif line_lower.startswith('object network'):
-                    i, nat_seq_counter = self._parse_object_network(i, block_lines, config, context_name, duplicates,
-                                                                    nat_seq_counter)
-                elif line_lower.startswith('object service'):
-                    i = self._parse_object_service(i, block_lines, config, context_name, duplicates)
-                elif line_lower.startswith('object-group network'):
-                    i = self._parse_address_group(i, block_lines, config, context_name, duplicates)
-                elif line_lower.startswith('object-group service'):
-                    i = self._parse_service_group(i, block_lines, config, context_name, duplicates)
-                elif line_lower.startswith('time-range'):
-                    i = self._parse_time_range(i, block_lines, config, context_name, duplicates)
-
-                # --- Rules & NAT ---
-                elif line_lower.startswith('access-list'):
-                    rule_seq_counter = self._parse_rule(line, config, context_name, duplicates, rule_seq_counter,
-                                                        last_remark)
-                    last_remark = None
-                    i += 1
-                elif line_lower.startswith('nat ('):
-                    nat_seq_counter = self._parse_nat_rule_line(line, config, context_name, duplicates, nat_seq_counter)
-                    i += 1
-                
-                # --- [NEW] Catch Unparsed Lines ---
-                else:
-                    # Filter out common noise
-                    if not any(k in line_lower for k in ['hostname', 'domain-name', 'names', 'pager', 'logging', 'aaa', 'ssh', 'http', 'console', 'terminal', 'crypto', 'policy-map', 'class-map', 'service-policy']):
-                        config.conversion_warnings.append(ConversionWarning(
-                            category='Parser',
-                            message='Skipped unparsed line',
-                            original_line=line,
-                            severity='info'
-                        ))
-                    i += 1
-
-        print(f"DEBUG: Parsing selesai. Total Routes: {len(config.static_routes)}")
-        return config
+        self._name_cache = {}
+        # Blok router OSPF/BGP dikumpulkan dulu, lalu digabung sekali ke dynamic_routing_config di akhir parse
+        self._routing_blocks = []
+        lines, duplicates = self._clean_lines(content)
+
+        # Versi lowercase tiap baris dibuat sekali dan dipakai bersama oleh dispatcher dan semua sub-parser
+        lines_lower = [l.lower() for l in lines]
+
+        # Hanya konteks 'default' yang didukung; baris langsung diproses tanpa dict per konteks
+        state = _ParseState(config=config, duplicates=duplicates, lines=lines, lines_lower=lines_lower)
+        handlers = {keyword: tuple((prefix, getattr(self, name)) for prefix, name in entries)
+                    for keyword, entries in self._LINE_HANDLERS.items()}
+        keyword_match = self._RE_KEYWORD.match
+        noise_search = self._RE_NOISE.search
+
+        logger.debug("Memulai parsing Cisco ASA. Total baris: %d", len(lines))
+
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            line_lower = lines_lower[i]
+
+            if not line or line.startswith('!') or line.startswith(':'):
+                i += 1
+                continue
+
+            for prefix, handler in handlers.get(keyword_match(line_lower).group(), ()):
+                if line_lower.startswith(prefix):
+                    i = handler(i, state)
+                    break
+
+            # --- [NEW] Catch Unparsed Lines ---
+            else:
+                # Filter out common noise
+                if not noise_search(line_lower):
+                    config.conversion_warnings.append(ConversionWarning(
+                        category='Parser',
+                        message='Skipped unparsed line',
+                        original_line=line,
+                        severity='info'
+                    ))
+                i += 1
+
+        config.dynamic_routing_config += "".join(self._routing_blocks)
+        logger.debug("Parsing selesai. Total Routes: %d", len(config.static_routes))
+        return self._freeze_members(config)
+
+    # --- Handler dispatch: semua memakai signature (index, state) dan mengembalikan index berikutnya ---
+    def _on_router_ospf(self, i: int, state: _ParseState) -> int:
+        return self._parse_router_ospf(i, state.lines, state.lines_lower, state.config)
+
+    def _on_router_bgp(self, i: int, state: _ParseState) -> int:
+        return self._parse_router_bgp(i, state.lines, state.lines_lower, state.config)
+
+    def _on_static_route(self, i: int, state: _ParseState) -> int:
+        self._parse_static_route(state.lines[i], state.config)
+        return i + 1
+
+    def _on_interface(self, i: int, state: _ParseState) -> int:
+        return self._parse_interface_block(i, state.lines, state.lines_lower, state.config)
+
+    def _on_object_network(self, i: int, state: _ParseState) -> int:
+        i, state.nat_seq = self._parse_object_network(i, state.lines, state.lines_lower, state.config,
+                                                      state.context_name, state.duplicates, state.nat_seq)
+        return i
+
+    def _on_object_service(self, i: int, state: _ParseState) -> int:
+        return self._parse_object_service(i, state.lines, state.lines_lower, state.config, state.context_name,
+                                          state.duplicates)
+
+    def _on_address_group(self, i: int, state: _ParseState) -> int:
+        return self._parse_address_group(i, state.lines, state.lines_lower, state.config, state.context_name,
+                                         state.duplicates)
+
+    def _on_service_group(self, i: int, state: _ParseState) -> int:
+        return self._parse_service_group(i, state.lines, state.lines_lower, state.config, state.context_name,
+                                         state.duplicates)
+
+    def _on_time_range(self, i: int, state: _ParseState) -> int:
+        return self._parse_time_range(i, state.lines, state.lines_lower, state.config, state.context_name,
+                                      state.duplicates)
+
+    def _on_access_list(self, i: int, state: _ParseState) -> int:
+        line = state.lines[i]
+        if ' remark ' in state.lines_lower[i]:
+            parts = self._RE_REMARK_SPLIT.split(line)
+            if len(parts) > 1:
+                state.last_remark = parts[1].strip()
+        else:
+            state.rule_seq = self._parse_rule(line, state.config, state.context_name, state.duplicates,
+                                              state.rule_seq, state.last_remark)
+            state.last_remark = None
+        return i + 1
+
+    def _on_nat(self, i: int, state: _ParseState) -> int:
+        state.nat_seq = self._parse_nat_rule_line(state.lines[i], state.config, state.context_name,
+                                                  state.duplicates, state.nat_seq)
+        return i + 1
 
     def _parse_static_route(self, line: str, config: FirewallConfig):
         """Parsing baris rute statis Cisco ASA."""
-        parts = line.split()
+        # Hanya 6 token pertama yang dipakai (route IFACE DEST MASK GW [DISTANCE])
+        parts = line.split(None, 6)
         if len(parts) < 5: return
 
         iface = parts[1]
@@ -164,11 +231,8 @@ class CiscoAsaParser(BaseParser):
         if dest_ip == "0.0.0.0" and dest_mask == "0.0.0.0":
             destination = "0.0.0.0/0"
         else:
-            try:
-                cidr = self._mask_to_cidr(dest_mask)
-                destination = f"{dest_ip}/{cidr}"
-            except:
-                destination = f"{dest_ip}/{dest_mask}"
+            # _mask_to_cidr tidak melempar exception (mask tidak valid menjadi "32")
+            destination = f"{dest_ip}/{self._mask_to_cidr(dest_mask)}"
 
         config.static_routes.append(StaticRoute(
             destination=destination,
@@ -177,7 +241,7 @@ class CiscoAsaParser(BaseParser):
             distance=distance
         ))
 
-    def _parse_router_ospf(self, index: int, lines: List[str], config: FirewallConfig) -> int:
+    def _parse_router_ospf(self, index: int, lines: List[str], lines_lower: List[str], config: FirewallConfig) -> int:
         """Parsing blok OSPF."""
         ospf_block_lines = []
         i = index
@@ -187,7 +251,7 @@ class CiscoAsaParser(BaseParser):
         i += 1
         while i < len(lines):
             line = lines[i]
-            line_lower = line.lower()
+            line_lower = lines_lower[i]
 
             if i > index and line_lower.startswith(self.STOP_TOKENS):
                 break
@@ -195,16 +259,11 @@ class CiscoAsaParser(BaseParser):
             if line: ospf_block_lines.append(line)
 
             if line_lower.startswith("network"):
-                parts = line.split()
+                parts = line.split(None, 3)
                 if len(parts) >= 3:
                     ip = parts[1]
                     mask = parts[2]
-                    destination = f"{ip} {mask}"
-                    try:
-                        cidr = self._mask_to_cidr(mask)
-                        destination = f"{ip}/{cidr}"
-                    except:
-                        pass
+                    destination = f"{ip}/{self._mask_to_cidr(mask)}"
 
                     config.static_routes.append(StaticRoute(
                         destination=destination,
@@ -217,12 +276,12 @@ class CiscoAsaParser(BaseParser):
                     ))
             i += 1
 
-        if ospf_block_lines and hasattr(config, 'dynamic_routing_config'):
-            config.dynamic_routing_config += "\n".join(ospf_block_lines) + "\n\n"
+        if ospf_block_lines:
+            self._routing_blocks.append("\n".join(ospf_block_lines) + "\n\n")
 
         return i
 
-    def _parse_router_bgp(self, index: int, lines: List[str], config: FirewallConfig) -> int:
+    def _parse_router_bgp(self, index: int, lines: List[str], lines_lower: List[str], config: FirewallConfig) -> int:
         bgp_block_lines = []
         if index < len(lines):
             bgp_block_lines.append(lines[index])
@@ -230,7 +289,7 @@ class CiscoAsaParser(BaseParser):
         i = index + 1
         while i < len(lines):
             line = lines[i]
-            line_lower = line.lower()
+            line_lower = lines_lower[i]
 
             if i > index and line_lower.startswith(self.STOP_TOKENS):
                 break
@@ -243,18 +302,10 @@ class CiscoAsaParser(BaseParser):
                     ip = parts[1]
                     mask = "255.255.255.0"
                     if "mask" in parts:
-                        try:
-                            mask_idx = parts.index("mask")
-                            if mask_idx + 1 < len(parts): mask = parts[mask_idx + 1]
-                        except:
-                            pass
-
-                    destination = f"{ip} {mask}"
-                    try:
-                        cidr = self._mask_to_cidr(mask)
-                        destination = f"{ip}/{cidr}"
-                    except:
-                        pass
+                        mask_idx = parts.index("mask")
+                        if mask_idx + 1 < len(parts): mask = parts[mask_idx + 1]
+
+                    destination = f"{ip}/{self._mask_to_cidr(mask)}"
 
                     config.static_routes.append(StaticRoute(
                         destination=destination,
@@ -267,18 +318,19 @@ class CiscoAsaParser(BaseParser):
                     ))
             i += 1
 
-        if bgp_block_lines and hasattr(config, 'dynamic_routing_config'):
-            config.dynamic_routing_config += "\n".join(bgp_block_lines) + "\n\n"
+        if bgp_block_lines:
+            self._routing_blocks.append("\n".join(bgp_block_lines) + "\n\n")
         return i
 
-    def _parse_interface_block(self, index: int, lines: List[str], config: FirewallConfig) -> int:
+    def _parse_interface_block(self, index: int, lines: List[str], lines_lower: List[str],
+                               config: FirewallConfig) -> int:
         match = self._RE_INTERFACE_BLOCK.match(lines[index])
         if not match: return index + 1
         iface_data = {'name': match.group(1)}
         i = index + 1
         while i < len(lines):
             line = lines[i]
-            if line.lower().startswith(self.STOP_TOKENS): break
+            if lines_lower[i].startswith(self.STOP_TOKENS): break
             if not line or line.startswith('!'): i += 1; continue
 
             if line.startswith("nameif "):
@@ -287,55 +339,69 @@ class CiscoAsaParser(BaseParser):
                 parts = line.split(" ", 1)
                 if len(parts) > 1: iface_data['description'] = parts[1]
             elif line.startswith("ip address "):
-                parts = line.split()
+                parts = line.split(None, 4)
                 if len(parts) >= 3:
                     iface_data['ip_address'] = parts[2]
                     if len(parts) > 3: iface_data['mask_length'] = self._mask_to_cidr(parts[3])
             elif line.startswith("vlan "):
                 try:
                     iface_data['vlan_id'] = int(line.split()[1])
-                except:
+                except (ValueError, IndexError):
                     pass
             i += 1
         config.interfaces.add(Interface(**iface_data))
         return i
 
-    def _split_into_contexts(self, lines: List[str]) -> Dict[str, List[str]]:
-        return {'default': lines}
-
-    def _discover_duplicates(self, context_blocks: Dict[str, List[str]]) -> Set[str]:
+    def _clean_lines(self, content: str) -> (List[str], Set[str]):
+        """
+        Membersihkan semua baris dan, dalam lintasan yang sama, mencari nama object/object-group yang
+        didefinisikan lebih dari sekali. List baris mentah dari splitlines() tidak disimpan setelahnya.
+        """
+        lines = []
         all_names = {}
-        for context, blks in context_blocks.items():
-            for line in blks:
-                match = self._RE_OBJ_NAME.match(line)
+        clean_line = self._clean_line
+        obj_name_match = self._RE_OBJ_NAME.match
+        for raw_line in content.splitlines():
+            line = clean_line(raw_line)
+            lines.append(line)
+            if line.startswith('object'):
+                match = obj_name_match(line)
                 if match:
                     name = match.group(1)
                     all_names[name] = all_names.get(name, 0) + 1
-        return {name for name, count in all_names.items() if count > 1}
+        return lines, {name for name, count in all_names.items() if count > 1}
 
     def _get_new_name(self, original_name, context_name, duplicates):
-        if original_name in duplicates and context_name != 'default':
-            return f"{original_name}_{context_name}"
-        return original_name
+        # Nama yang sama dirujuk berulang kali oleh rule, grup, dan NAT; hasilnya di-cache dan di-intern
+        # agar setiap nama unik hanya disimpan sebagai satu objek string
+        key = (original_name, context_name)
+        new_name = self._name_cache.get(key)
+        if new_name is None:
+            if original_name in duplicates and context_name != 'default':
+                new_name = f"{original_name}_{context_name}"
+            else:
+                new_name = original_name
+            new_name = self._name_cache[key] = sys.intern(new_name)
+        return new_name
 
-    def _parse_time_range(self, index, lines, config, context_name, duplicates):
+    def _parse_time_range(self, index, lines, lines_lower, config, context_name, duplicates):
         match = self._RE_TIME_RANGE.search(lines[index])
         if not match: return index + 1
         original_name = match.group(1)
         new_name = self._get_new_name(original_name, context_name, duplicates)
         time_range = TimeRange(name=new_name, original_text=lines[index])
         i = index + 1
-        while i < len(lines) and not lines[i].lower().startswith(self.STOP_TOKENS): i += 1
+        while i < len(lines) and not lines_lower[i].startswith(self.STOP_TOKENS): i += 1
         config.time_ranges.add(time_range)
         return i
 
-    def _parse_object_network(self, index, lines, config, context, duplicates, nat_counter):
+    def _parse_object_network(self, index, lines, lines_lower, config, context, duplicates, nat_counter):
         match = self._RE_OBJ_NETWORK.match(lines[index])
         if not match: return index + 1, nat_counter
         name = self._get_new_name(match.group(1), context, duplicates)
         i = index + 1
 
-        while i < len(lines) and not lines[i].lower().startswith(self.STOP_TOKENS):
+        while i < len(lines) and not lines_lower[i].startswith(self.STOP_TOKENS):
             line = lines[i]
             if line.startswith('host '):
                 config.addresses.add(
@@ -394,12 +460,12 @@ class CiscoAsaParser(BaseParser):
             i += 1
         return i, nat_counter
 
-    def _parse_object_service(self, index, lines, config, context, duplicates):
+    def _parse_object_service(self, index, lines, lines_lower, config, context, duplicates):
         match = self._RE_OBJ_SERVICE.match(lines[index])
         if not match: return index + 1
         name = self._get_new_name(match.group(1), context, duplicates)
         i = index + 1
-        while i < len(lines) and not lines[i].lower().startswith(self.STOP_TOKENS):
+        while i < len(lines) and not lines_lower[i].startswith(self.STOP_TOKENS):
             line = lines[i]
             svc_match = self._RE_SERVICE_DEF.search(line)
             if svc_match:
@@ -409,12 +475,12 @@ class CiscoAsaParser(BaseParser):
             i += 1
         return i
 
-    def _parse_address_group(self, index, lines, config, context, duplicates):
+    def _parse_address_group(self, index, lines, lines_lower, config, context, duplicates):
         match = self._RE_ADDR_GROUP.match(lines[index])
         if not match: return index + 1
         group = Group(name=self._get_new_name(match.group(1), context, duplicates))
         i = index + 1
-        while i < len(lines) and not lines[i].lower().startswith(self.STOP_TOKENS):
+        while i < len(lines) and not lines_lower[i].startswith(self.STOP_TOKENS):
             line = lines[i]
             if 'network-object object' in line:
                 parts = line.split()
@@ -437,14 +503,14 @@ class CiscoAsaParser(BaseParser):
         config.address_groups.add(group)
         return i
 
-    def _parse_service_group(self, index, lines, config, context, duplicates):
+    def _parse_service_group(self, index, lines, lines_lower, config, context, duplicates):
         match = self._RE_SVC_GROUP.match(lines[index])
         if not match: return index + 1
         group_name = self._get_new_name(match.group(1), context, duplicates)
         default_proto = match.group(2) if match.lastindex >= 2 else None
         group = ServiceGroup(name=group_name)
         i = index + 1
-        while i < len(lines) and not lines[i].lower().startswith(self.STOP_TOKENS):
+        while i < len(lines) and not lines_lower[i].startswith(self.STOP_TOKENS):
             line = lines[i]
             # [FIXED] Added support for group-object inside service groups
             if 'service-object object' in line:
@@ -471,19 +537,21 @@ class CiscoAsaParser(BaseParser):
         config.service_groups.add(group)
         return i
 
-    def _consume_address(self, tokens: List[str]) -> (str, List[str]):
-        if not tokens: return None, []
-        kw = tokens[0]
-        if kw in ['any', 'any4']: return 'any', tokens[1:]
-        if kw == 'host' and len(tokens) >= 2: return f"host {tokens[1]}", tokens[2:]
-        if kw == 'object-group' and len(tokens) >= 2: return f"object-group {tokens[1]}", tokens[2:]
-        if kw == 'object' and len(tokens) >= 2: return f"object {tokens[1]}", tokens[2:]
-        if self._RE_IP_MASK.match(kw):
-            if len(tokens) >= 2 and self._RE_IP_MASK.match(tokens[1]):
-                return f"{tokens[0]} {tokens[1]}", tokens[2:]
+    def _consume_address(self, tokens: List[str], pos: int) -> (str, int):
+        """Membaca satu operand alamat mulai dari tokens[pos]; mengembalikan (alamat, posisi token berikutnya)."""
+        if pos >= len(tokens): return None, pos
+        kw = tokens[pos]
+        has_next = pos + 1 < len(tokens)
+        width = self._ADDR_KEYWORDS.get(kw)
+        if width == 1: return 'any', pos + 1
+        if width == 2 and has_next: return f"{kw} {tokens[pos + 1]}", pos + 2
+        # IP selalu diawali digit; regex hanya dijalankan untuk token yang lolos cek murah ini
+        if kw[:1].isdigit() and self._RE_IP_MASK.match(kw):
+            if has_next and self._RE_IP_MASK.match(tokens[pos + 1]):
+                return f"{kw} {tokens[pos + 1]}", pos + 2
             else:
-                return f"host {tokens[0]}", tokens[1:]
-        return None, tokens
+                return f"host {kw}", pos + 1
+        return None, pos
 
     def _parse_address_part(self, part_str: str, config: FirewallConfig, context_name: str,
                             duplicates: Set[str]) -> str:
@@ -493,7 +561,7 @@ class CiscoAsaParser(BaseParser):
         if parts[0] == 'host':
             ip = parts[1];
             host_name = f"host_{ip}"
-            if not any(a.name == host_name for a in config.addresses): config.addresses.add(
+            if config.addresses.get(host_name) is None: config.addresses.add(
                 Address(name=host_name, type='host', value1=ip))
             return host_name
         if parts[0] in ['object-group', 'object']: return self._get_new_name(parts[1], context_name, duplicates)
@@ -501,95 +569,119 @@ class CiscoAsaParser(BaseParser):
             ip, mask = parts;
             cidr = self._mask_to_cidr(mask);
             net_name = f"net_{ip}_{cidr}"
-            if not any(a.name == net_name for a in config.addresses): config.addresses.add(
+            if config.addresses.get(net_name) is None: config.addresses.add(
                 Address(name=net_name, type='network', value1=ip, value2=str(cidr)))
             return net_name
         return None
 
+    def _strip_rule_tail(self, line: str) -> str:
+        """
+        Membuang ekor ACE yang bukan bagian match: ' log ...' (sampai akhir baris), ' inactive' di akhir,
+        atau ' time-range NAMA' di akhir. Hanya potongan yang mulai paling awal yang dibuang, sama dengan
+        re.sub(r'\s+log.*$|\s+inactive$|\s+time-range \S+$', '', line).strip() sebelumnya, tetapi lewat
+        str.find/endswith tanpa mencoba regex di setiap posisi karakter.
+        """
+        cut = line.find(' log')
+        if cut == -1:
+            cut = len(line)
+        if line.endswith(' inactive'):
+            cut = min(cut, len(line) - 9)
+        head, sep, last = line.rpartition(' ')
+        if last and head.endswith(' time-range'):
+            cut = min(cut, len(head) - 11)
+        return line[:cut].strip()
+
     def _parse_rule(self, line: str, config: FirewallConfig, context: str, duplicates: Set[str], seq_id: int,
                     remark: str = None):
-        try:
-            is_enabled = not line.strip().endswith('inactive')
-            time_range_match = self._RE_RULE_TIME_RANGE.search(line)
-            time_range_name = self._get_new_name(time_range_match.group(1), context,
-                                                 duplicates) if time_range_match else None
-
-            # [NEW] Extract Hit Count
-            hit_count = 0
-            hit_count_match = re.search(r'\(hitcnt=(\d+)\)', line)
-            if hit_count_match:
-                hit_count = int(hit_count_match.group(1))
-                line = line.replace(hit_count_match.group(0), '') # Remove from line to avoid parsing interference
-
-            clean_line = self._RE_CLEAN_RULE.sub('', line).strip()
-            parts = clean_line.split()
-            if len(parts) < 5 or 'extended' not in parts: return seq_id
-
-            ext_index = parts.index('extended')
-            acl_name = parts[1]
-            action_raw = parts[ext_index + 1].lower()
-            standardized_action = "allow" if action_raw == "permit" else "deny"
-
-            tokens = parts[ext_index + 2:]
-            src_interface = acl_name.replace('_access_in', '').replace('_in', '')
-            if not tokens: return seq_id
-
-            proto_or_grp = tokens.pop(0)
-            svc_grp_name, proto = None, None
-
-            if proto_or_grp in ['object-group', 'object']:
-                svc_grp_name = self._get_new_name(tokens.pop(0), context, duplicates)
-            else:
-                proto = proto_or_grp
+        is_enabled = not line.strip().endswith('inactive')
+        time_range_match = self._RE_RULE_TIME_RANGE.search(line) if 'time-range' in line else None
+        time_range_name = self._get_new_name(time_range_match.group(1), context,
+                                             duplicates) if time_range_match else None
+
+        # [NEW] Extract Hit Count
+        hit_count = 0
+        hit_count_match = self._RE_HIT_COUNT.search(line) if '(hitcnt=' in line else None
+        if hit_count_match:
+            hit_count = int(hit_count_match.group(1))
+            line = line.replace(hit_count_match.group(0), '') # Remove from line to avoid parsing interference
+
+        parts = self._strip_rule_tail(line).split()
+        if len(parts) < 5 or 'extended' not in parts: return seq_id
+
+        ext_index = parts.index('extended')
+        if ext_index + 1 >= len(parts): return seq_id
+        acl_name = parts[1]
+        action_raw = parts[ext_index + 1].lower()
+        standardized_action = "allow" if action_raw == "permit" else "deny"
+
+        # Token match dibaca lewat indeks pada parts, tanpa menyalin sisa list di setiap langkah
+        pos = ext_index + 2
+        src_interface = acl_name.replace('_access_in', '').replace('_in', '')
+        if pos >= len(parts): return seq_id
+
+        proto_or_grp = parts[pos]
+        pos += 1
+        svc_grp_name, proto = None, None
+
+        if proto_or_grp in ['object-group', 'object']:
+            if pos >= len(parts): return seq_id
+            svc_grp_name = self._get_new_name(parts[pos], context, duplicates)
+            pos += 1
+        else:
+            proto = proto_or_grp
 
-            src_str, tokens = self._consume_address(tokens)
-            dst_str, tokens = self._consume_address(tokens)
-            if not src_str or not dst_str: return seq_id
+        src_str, pos = self._consume_address(parts, pos)
+        dst_str, pos = self._consume_address(parts, pos)
+        if not src_str or not dst_str: return seq_id
 
-            rule = Rule(sequence_id=seq_id, name=f"{acl_name}-{seq_id}", action=standardized_action, context=context,
-                        remark=remark, enabled=is_enabled, time_range=time_range_name, source_interface={src_interface},
-                        original_text=line.strip(), hit_count=hit_count)
+        rule = Rule(sequence_id=seq_id, name=f"{acl_name}-{seq_id}", action=standardized_action, context=context,
+                    remark=remark, enabled=is_enabled, time_range=time_range_name, source_interface={src_interface},
+                    original_text=line.strip(), hit_count=hit_count)
 
-            s_val = self._parse_address_part(src_str, config, context, duplicates)
-            if s_val: rule.source.add(s_val)
-            d_val = self._parse_address_part(dst_str, config, context, duplicates)
-            if d_val: rule.destination.add(d_val)
+        s_val = self._parse_address_part(src_str, config, context, duplicates)
+        if s_val: rule.source.add(s_val)
+        d_val = self._parse_address_part(dst_str, config, context, duplicates)
+        if d_val: rule.destination.add(d_val)
 
-            if svc_grp_name:
-                rule.service.add(svc_grp_name)
+        if svc_grp_name:
+            rule.service.add(svc_grp_name)
+        else:
+            svc_str = " ".join(parts[pos:]).strip()
+            if svc_str:
+                if svc_str.startswith('object-group'):
+                    if pos + 1 >= len(parts): return seq_id
+                    rule.service.add(self._get_new_name(parts[pos + 1], context, duplicates))
+                else:
+                    svc_name = f"{proto.upper()}_{svc_str.replace(' ', '-')}"
+                    if config.services.get(svc_name) is None: config.services.add(
+                        Service(name=svc_name, protocol=proto, port=svc_str))
+                    rule.service.add(svc_name)
             else:
-                svc_str = " ".join(tokens).strip()
-                if svc_str:
-                    if svc_str.startswith('object-group'):
-                        rule.service.add(self._get_new_name(svc_str.split()[1], context, duplicates))
-                    else:
-                        svc_name = f"{proto.upper()}_{svc_str.replace(' ', '-')}"
-                        if not any(s.name == svc_name for s in config.services): config.services.add(
-                            Service(name=svc_name, protocol=proto, port=svc_str))
-                        rule.service.add(svc_name)
+                if proto.lower() == 'ip':
+                    if config.services.get("IP") is None: config.services.add(
+                        Service(name="IP", protocol="ip", port=""))
+                    rule.service.add("IP")
                 else:
-                    if proto.lower() == 'ip':
-                        if not any(s.name == "IP" for s in config.services): config.services.add(
-                            Service(name="IP", protocol="ip", port=""))
-                        rule.service.add("IP")
-                    else:
-                        if not any(s.name == proto.upper() for s in config.services): config.services.add(
-                            Service(name=proto.upper(), protocol=proto, port=""))
-                        rule.service.add(proto.upper())
+                    if config.services.get(proto.upper()) is None: config.services.add(
+                        Service(name=proto.upper(), protocol=proto, port=""))
+                    rule.service.add(proto.upper())
 
-            if rule.source and rule.destination and rule.service:
-                config.rules.append(rule);
-                return seq_id + 1
-            return seq_id
-        except:
-            return seq_id
+        if rule.source and rule.destination and rule.service:
+            config.rules.append(rule);
+            return seq_id + 1
+        return seq_id
 
     def _parse_nat_rule_line(self, line: str, config: FirewallConfig, context_name: str, duplicates: Set[str],
                              nat_seq_counter: int):
         is_enabled = 'inactive' not in line
-        twice_nat_match = self._RE_MANUAL_TWICE_NAT.search(line)
-        if twice_nat_match:
-            src_intf, dst_intf, orig_src, mapped_src, orig_dst, mapped_dst = twice_nat_match.groups()
+        nat_match = self._RE_MANUAL_NAT.search(line)
+        if not nat_match:
+            return nat_seq_counter
+        src_intf, dst_intf = nat_match.group('src_intf', 'dst_intf')
+
+        if nat_match['tw_src'] is not None:
+            orig_src, mapped_src, orig_dst, mapped_dst = nat_match.group('tw_src', 'tw_mapped_src', 'tw_dst',
+                                                                         'tw_mapped_dst')
             config.nat_rules.append(NatRule(
                 sequence_id=nat_seq_counter, name=f"TwiceNAT_{orig_src}_{orig_dst}",
                 source_interface={src_intf.strip()}, destination_interface={dst_intf.strip()},
@@ -601,9 +693,8 @@ class CiscoAsaParser(BaseParser):
             ));
             return nat_seq_counter + 1
 
-        static_nat_match = self._RE_MANUAL_STATIC_NAT.search(line)
-        if static_nat_match:
-            src_intf, dst_intf, orig_src, mapped_src, unidirectional = static_nat_match.groups()
+        if nat_match['st_src'] is not None:
+            orig_src, mapped_src, unidirectional = nat_match.group('st_src', 'st_mapped_src', 'unidirectional')
             mapped_src = mapped_src.strip()
             config.nat_rules.append(NatRule(
                 sequence_id=nat_seq_counter, name=f"StaticNAT_{orig_src}",
@@ -624,9 +715,8 @@ class CiscoAsaParser(BaseParser):
                 nat_seq_counter += 1
             return nat_seq_counter
 
-        dynamic_pat_match = self._RE_MANUAL_DYNAMIC_PAT.search(line)
-        if dynamic_pat_match:
-            src_intf, dst_intf, orig_src = dynamic_pat_match.groups()
+        if nat_match['pat_src'] is not None:
+            orig_src = nat_match['pat_src']
             config.nat_rules.append(NatRule(
                 sequence_id=nat_seq_counter, name=f"DynamicPAT_{orig_src}",
                 source_interface={src_intf.strip()}, destination_interface={dst_intf.strip()},
@@ -636,16 +726,12 @@ class CiscoAsaParser(BaseParser):
             ));
             return nat_seq_counter + 1
 
-        dynamic_nat_match = self._RE_MANUAL_DYNAMIC_NAT.search(line)
-        if dynamic_nat_match:
-            src_intf, dst_intf, orig_src, mapped_src = dynamic_nat_match.groups()
-            config.nat_rules.append(NatRule(
-                sequence_id=nat_seq_counter, name=f"DynamicNAT_{orig_src}",
-                source_interface={src_intf.strip()}, destination_interface={dst_intf.strip()},
-                original_source={self._get_new_name(orig_src, context_name, duplicates)},
-                translated_source=self._get_new_name(mapped_src, context_name, duplicates),
-                enabled=is_enabled, original_text=line
-            ));
-            return nat_seq_counter + 1
-
-        return nat_seq_counter
\ No newline at end of file
+        orig_src, mapped_src = nat_match.group('dyn_src', 'dyn_mapped_src')
+        config.nat_rules.append(NatRule(
+            sequence_id=nat_seq_counter, name=f"DynamicNAT_{orig_src}",
+            source_interface={src_intf.strip()}, destination_interface={dst_intf.strip()},
+            original_source={self._get_new_name(orig_src, context_name, duplicates)},
+            translated_source=self._get_new_name(mapped_src, context_name, duplicates),
+            enabled=is_enabled, original_text=line
+        ));
+        return nat_seq_counter + 1
\ No newline at end of file
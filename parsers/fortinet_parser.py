@@ -10,6 +10,7 @@ Updated:
 6. [FIX] Improved nested config block skipping for warnings.
 """
 import re
+import sys
 from typing import List, Tuple, Dict, Set
 
 from models import FirewallConfig, Address, Group, Service, ServiceGroup, Rule, NatRule, StaticRoute, Interface, ConversionWarning
@@ -18,51 +19,94 @@ from .base import BaseParser
 
 class FortinetParser(BaseParser):
     """Parser untuk konfigurasi FortiGate yang telah disempurnakan."""
+    _RE_CLEAN_SVC = re.compile(r'^(TCP/UDP|UDP/TCP)[_\-\s]*', re.IGNORECASE)
+    _RE_MULTI_VAL = re.compile(r'(?:"([^"]+)"|(\S+))')
+    _RE_NUMERIC = re.compile(r'^\d+$')
+    # 'set prefix <ip> <mask>' atau 'set prefix <ip/cidr>' di blok OSPF/BGP
+    _RE_SET_PREFIX = re.compile(r'set prefix\S*\s+(\S+)(?:\s+(\S+))?')
+
+    # Header blok -> (nama method parser entry, nama counter sequence atau None)
+    _BLOCK_PARSERS = {
+        # --- Firewall Objects ---
+        "config firewall address": ('_parse_address_entry', None),
+        "config firewall addrgrp": ('_parse_address_group_entry', None),
+        "config firewall service custom": ('_parse_service_entry', None),
+        "config firewall service group": ('_parse_service_group_entry', None),
+        "config firewall policy": ('_parse_policy_entry', 'policy'),
+        "config firewall vip": ('_parse_vip_entry', 'nat'),
+        "config firewall central-snat-map": ('_parse_central_snat_entry', 'nat'),
+        # --- Network & Routing ---
+        "config system zone": ('_parse_zone_entry', None),
+        "config router static": ('_parse_static_route_entry', None),
+        "config system interface": ('_parse_interface_entry', None),
+    }
+
+    # Blok yang dikenal tapi sengaja diabaikan (tanpa ConversionWarning)
+    _IGNORED_BLOCK_PREFIXES = ('config system', 'config log', 'config user', 'config vpn', 'config ips',
+                               'config application')
+
+    # Dispatch baris 'set' per jenis entry. Kunci = 3 karakter setelah "set ", nilai = kandidat
+    # (prefix, field, jenis) yang dicek berurutan dengan startswith agar semantik prefix lama tetap sama.
+    # Jenis: 'multi' = gabungkan ke set, 'list' = daftar nilai terakhir, 'value' = nilai terakhir, 'flag' = True.
+    _POLICY_SET_FIELDS = {
+        'nam': (('set name', 'name', 'value'),),
+        'src': (('set srcintf', 'source_interface', 'multi'), ('set srcaddr', 'source', 'multi')),
+        'dst': (('set dstintf', 'destination_interface', 'multi'), ('set dstaddr', 'destination', 'multi')),
+        'ser': (('set service', 'service', 'multi'),),
+        'act': (('set action', 'action', 'value'),),
+        'sta': (('set status', 'status', 'value'),),
+        'com': (('set comments', 'remark', 'value'),),
+        'nat': (('set nat enable', 'nat', 'flag'),),
+        'poo': (('set poolname', 'poolname', 'value'),),
+        'ips': (('set ips-sensor', 'ips', 'value'),),
+        'av-': (('set av-profile', 'av', 'value'),),
+    }
+    _VIP_SET_FIELDS = {
+        'typ': (('set type twice-nat', 'is_twice_nat', 'flag'),),
+        'ext': (('set extip', 'extip', 'value'),),
+        'map': (('set mappedip', 'mappedip', 'value'),),
+        'src': (('set src-filter', 'src_filter', 'multi'),),
+        'nat': (('set nat-ippool', 'nat_ippool', 'value'),),
+    }
+    _CENTRAL_SNAT_SET_FIELDS = {
+        'src': (('set srcintf', 'source_interface', 'multi'),),
+        'dst': (('set dstintf', 'destination_interface', 'multi'), ('set dst-addr', 'original_destination', 'multi')),
+        'ori': (('set orig-addr', 'original_source', 'multi'),),
+        'nat': (('set nat-ippool', 'translated_source', 'list'),),
+        'sta': (('set status', 'status', 'value'),),
+        'com': (('set comments', 'remark', 'value'),),
+    }
 
     def __init__(self):
         super().__init__()
         self.split_services_map: Dict[str, List[str]] = {}
         self.interface_to_zone_map: Dict[str, str] = {}  # [NEW] Menyimpan mapping interface member ke zone
+        self.address_by_value1: Dict[str, Address] = {}  # Indeks value1 -> Address untuk lookup VIP
 
     def parse(self, content: str, **kwargs) -> FirewallConfig:
         config = FirewallConfig()
         self.split_services_map = {}
         self.interface_to_zone_map = {}  # Reset mapping setiap kali parse
+        self.address_by_value1 = {}
 
-        lines = [line.strip() for line in content.splitlines() if line.strip() and not line.strip().startswith('#')]
+        lines = [line for line in map(str.strip, content.splitlines()) if line and line[0] != '#']
 
-        policy_seq_counter = 1
-        nat_seq_counter = 1
+        seq_counters = {'policy': 1, 'nat': 1}
+        block_parsers = {header: (getattr(self, method_name), counter)
+                         for header, (method_name, counter) in self._BLOCK_PARSERS.items()}
 
         i = 0
         while i < len(lines):
             line = lines[i]
 
-            # --- Firewall Objects ---
-            if line == "config firewall address":
-                i, _ = self._parse_block(i, lines, config, self._parse_address_entry)
-            elif line == "config firewall addrgrp":
-                i, _ = self._parse_block(i, lines, config, self._parse_address_group_entry)
-            elif line == "config firewall service custom":
-                i, _ = self._parse_block(i, lines, config, self._parse_service_entry)
-            elif line == "config firewall service group":
-                i, _ = self._parse_block(i, lines, config, self._parse_service_group_entry)
-            elif line == "config firewall policy":
-                i, policy_seq_counter = self._parse_block(i, lines, config, self._parse_policy_entry,
-                                                          policy_seq_counter)
-            elif line == "config firewall vip":
-                i, nat_seq_counter = self._parse_block(i, lines, config, self._parse_vip_entry, nat_seq_counter)
-            elif line == "config firewall central-snat-map":
-                i, nat_seq_counter = self._parse_block(i, lines, config, self._parse_central_snat_entry,
-                                                       nat_seq_counter)
-
-            # --- Network & Routing ---
-            elif line == "config system zone":
-                i, _ = self._parse_block(i, lines, config, self._parse_zone_entry)
-            elif line == "config router static":
-                i, _ = self._parse_block(i, lines, config, self._parse_static_route_entry)
-            elif line == "config system interface":
-                i, _ = self._parse_block(i, lines, config, self._parse_interface_entry)
+            block_parser = block_parsers.get(line)
+            if block_parser is not None:
+                entry_parser_func, counter = block_parser
+                if counter is None:
+                    i, _ = self._parse_block(i, lines, config, entry_parser_func)
+                else:
+                    i, seq_counters[counter] = self._parse_block(i, lines, config, entry_parser_func,
+                                                                 seq_counters[counter])
 
             # --- Dynamic Routing (OSPF/BGP) ---
             elif line.startswith("config router ospf") or line.startswith("config router bgp"):
@@ -74,8 +118,7 @@ class FortinetParser(BaseParser):
                 block_content = []
                 
                 # Skip known ignored blocks to reduce noise if needed
-                ignored_blocks = ['config system', 'config log', 'config user', 'config vpn', 'config ips', 'config application']
-                is_ignored = any(line.startswith(b) for b in ignored_blocks)
+                is_ignored = line.startswith(self._IGNORED_BLOCK_PREFIXES)
                 
                 # Capture block content with nesting support
                 i += 1
@@ -88,7 +131,7 @@ class FortinetParser(BaseParser):
                     elif current_line == "end":
                         depth -= 1
                     
-                    if depth > 0: # Don't include the final 'end' of the main block in content if you prefer
+                    if depth > 0 and not is_ignored: # Don't include the final 'end' of the main block in content if you prefer
                          block_content.append(current_line)
                     
                     i += 1
@@ -110,21 +153,27 @@ class FortinetParser(BaseParser):
         self._apply_zone_mappings(config)  # [NEW] Terapkan mapping zone ke interface
 
         # Mengasosiasikan interface ke zona (Logic lama tetap dipertahankan sebagai fallback/cleanup)
-        all_zones = {iface.name for iface in config.interfaces if iface.ip_address is None}
+        # Interface yang sudah berupa zona semua dibiarkan apa adanya (set tidak dibangun ulang)
+        all_zones = frozenset(iface.name for iface in config.interfaces if iface.ip_address is None)
         for rule in config.rules:
-            rule.source_interface = {z for z in rule.source_interface if z in all_zones} or rule.source_interface
-            rule.destination_interface = {z for z in rule.destination_interface if
-                                          z in all_zones} or rule.destination_interface
+            zones = rule.source_interface & all_zones
+            if zones and len(zones) != len(rule.source_interface):
+                rule.source_interface = zones
+            zones = rule.destination_interface & all_zones
+            if zones and len(zones) != len(rule.destination_interface):
+                rule.destination_interface = zones
 
-        return config
+        return self._freeze_members(config)
 
     def _apply_zone_mappings(self, config: FirewallConfig):
         """
         [NEW] Mengupdate objek Interface yang sudah ada dengan informasi Zone yang sesuai.
         """
-        for iface in config.interfaces:
-            if iface.name in self.interface_to_zone_map:
-                iface.zone = self.interface_to_zone_map[iface.name]
+        get_interface = config.interfaces.get
+        for iface_name, zone_name in self.interface_to_zone_map.items():
+            iface = get_interface(iface_name)
+            if iface is not None:
+                iface.zone = zone_name
 
     def _parse_dynamic_routing_block(self, index: int, lines: List[str], config: FirewallConfig) -> int:
         """
@@ -151,34 +200,26 @@ class FortinetParser(BaseParser):
             routing_lines.append(line)
 
             # --- LOGIKA UNTUK SET PREFIX ---
-            clean_line = line.strip()
-            if clean_line.startswith("set prefix"):
-                parts = clean_line.split()
-                destination = None
+            prefix_match = self._RE_SET_PREFIX.match(line)
+            if prefix_match:
+                ip, mask = prefix_match.groups()
 
                 # Case 1: Format IP Mask (Contoh: set prefix 10.12.9.40 255.255.255.252)
-                if len(parts) >= 4:
-                    ip = parts[2]
-                    mask = parts[3]
-                    try:
-                        cidr = self._mask_to_cidr(mask)
-                        destination = f"{ip}/{cidr}"
-                    except:
-                        # Fallback jika mask invalid
-                        destination = f"{ip} {mask}"
+                # _mask_to_cidr tidak pernah raise (mask invalid -> "32")
+                if mask is not None:
+                    destination = f"{ip}/{self._mask_to_cidr(mask)}"
 
                 # Case 2: Format CIDR (Contoh: set prefix 192.168.1.0/24)
-                elif len(parts) >= 3:
-                    destination = parts[2]
-
-                if destination:
-                    config.static_routes.append(StaticRoute(
-                        destination=destination,
-                        next_hop=f"Dynamic-{protocol}",
-                        interface=protocol.lower(),
-                        distance=110 if protocol == "OSPF" else 20,
-                        comment=f"Imported from {protocol} config: {clean_line}"
-                    ))
+                else:
+                    destination = ip
+
+                config.static_routes.append(StaticRoute(
+                    destination=destination,
+                    next_hop=f"Dynamic-{protocol}",
+                    interface=protocol.lower(),
+                    distance=110 if protocol == "OSPF" else 20,
+                    comment=f"Imported from {protocol} config: {line}"
+                ))
 
             i += 1
 
@@ -188,7 +229,7 @@ class FortinetParser(BaseParser):
         return i
 
     def _clean_service_name(self, name: str) -> str:
-        clean = re.sub(r'^(TCP/UDP|UDP/TCP)[_\-\s]*', '', name, flags=re.IGNORECASE)
+        clean = self._RE_CLEAN_SVC.sub('', name)
         clean = clean.replace('/', '').replace('\\', '')
         clean = clean.lstrip('_-. ')
         clean = clean.strip()
@@ -200,82 +241,96 @@ class FortinetParser(BaseParser):
         if not self.split_services_map:
             return
 
+        remap = self._remap_split_services
         for grp in config.service_groups:
-            new_members = set()
-            for member in grp.members:
-                if member in self.split_services_map:
-                    new_members.update(self.split_services_map[member])
-                else:
-                    new_members.add(member)
-            grp.members = new_members
-
+            grp.members = remap(grp.members)
         for rule in config.rules:
-            new_services = set()
-            for svc in rule.service:
-                if svc in self.split_services_map:
-                    new_services.update(self.split_services_map[svc])
-                else:
-                    new_services.add(svc)
-            rule.service = new_services
-
+            rule.service = remap(rule.service)
         for nat in config.nat_rules:
-            new_services = set()
-            for svc in nat.original_service:
-                if svc in self.split_services_map:
-                    new_services.update(self.split_services_map[svc])
-                else:
-                    new_services.add(svc)
-            nat.original_service = new_services
+            nat.original_service = remap(nat.original_service)
+
+    def _remap_split_services(self, members: Set[str]) -> Set[str]:
+        """Mengganti member yang ada di split_services_map dengan nama barunya; set tanpa member
+        ter-split dikembalikan apa adanya tanpa dibangun ulang."""
+        split_map = self.split_services_map
+        if members.isdisjoint(split_map):
+            return members
+        new_members = members.difference(split_map)
+        for member in members.intersection(split_map):
+            new_members.update(split_map[member])
+        return new_members
 
     def _parse_block(self, index: int, lines: List[str], config: FirewallConfig, entry_parser_func,
                      sequence_counter: int = None) -> Tuple[int, int]:
+        # Tahap 1: potong blok menjadi entry (edit ... next) sampai 'end'
         i = index + 1
         current_entry_lines = []
-
-        def process_entry():
-            nonlocal sequence_counter
-            if not current_entry_lines: return
-            if sequence_counter is not None:
-                entry_parser_func(current_entry_lines, config, sequence_counter)
-                sequence_counter += 1
-            else:
-                entry_parser_func(current_entry_lines, config)
-
+        entries = [current_entry_lines]
         while i < len(lines):
             line = lines[i]
+            i += 1
             if line == "end":
-                process_entry()
-                return i + 1, sequence_counter
+                break
             if line.startswith("edit "):
-                process_entry()
                 current_entry_lines = [line]
+                entries.append(current_entry_lines)
             elif line.startswith("next"):
-                process_entry()
                 current_entry_lines = []
+                entries.append(current_entry_lines)
             else:
                 current_entry_lines.append(line)
-            i += 1
-        process_entry()
+
+        # Tahap 2: parse setiap entry yang tidak kosong secara berurutan
+        if sequence_counter is None:
+            for entry_lines in entries:
+                if entry_lines:
+                    entry_parser_func(entry_lines, config)
+        else:
+            for entry_lines in entries:
+                if entry_lines:
+                    entry_parser_func(entry_lines, config, sequence_counter)
+                    sequence_counter += 1
         return i, sequence_counter
 
     def _get_edit_value(self, line: str) -> str:
-        parts = line.split(" ", 1)
-        if len(parts) < 2: return ""
-        value = parts[1].strip()
-        return value[1:-1] if value.startswith('"') and value.endswith('"') else value
+        value = line.partition(" ")[2].strip()
+        return value[1:-1] if value[:1] == '"' and value[-1:] == '"' else value
 
     def _get_set_value(self, line: str) -> str:
-        parts = line.split(" ", 2)
-        if len(parts) < 3: return ""
-        value = parts[2].strip()
-        return value[1:-1] if value.startswith('"') and value.endswith('"') else value
+        value = line.partition(" ")[2].partition(" ")[2].strip()
+        return value[1:-1] if value[:1] == '"' and value[-1:] == '"' else value
 
     def _extract_multi_values(self, line: str) -> List[str]:
-        parts = line.split(" ", 2)
-        if len(parts) < 3: return []
-        content = parts[2]
-        matches = re.findall(r'(?:"([^"]+)"|(\S+))', content)
-        return [m[0] or m[1] for m in matches]
+        content = line.partition(" ")[2].partition(" ")[2]
+        if '"' not in content:
+            values = content.split()
+        else:
+            # Bentuk umum '"a" "b" ...': bagian ganjil hasil split('"') adalah nilainya
+            # asalkan tidak kosong dan di antara tanda kutip hanya ada whitespace
+            parts = content.split('"')
+            values = parts[1::2]
+            if not (len(parts) % 2 and all(values) and not "".join(parts[::2]).strip()):
+                values = [m[0] or m[1] for m in self._RE_MULTI_VAL.findall(content)]
+        # Nama interface/objek yang sama muncul di ribuan rule; intern agar hanya disimpan sekali
+        return list(map(sys.intern, values))
+
+    def _collect_set_values(self, entry_lines: List[str], fields: Dict[str, tuple]) -> Dict[str, object]:
+        """Mengumpulkan nilai baris 'set' sebuah entry berdasarkan tabel dispatch *_SET_FIELDS."""
+        values = {}
+        get_candidates = fields.get
+        for line in entry_lines[1:]:
+            for prefix, field, kind in get_candidates(line[4:7], ()):
+                if line.startswith(prefix):
+                    if kind == 'multi':
+                        values.setdefault(field, set()).update(self._extract_multi_values(line))
+                    elif kind == 'list':
+                        values[field] = self._extract_multi_values(line)
+                    elif kind == 'value':
+                        values[field] = self._get_set_value(line)
+                    else:
+                        values[field] = True
+                    break
+        return values
 
     def _parse_interface_entry(self, entry_lines: List[str], config: FirewallConfig):
         if not entry_lines: return
@@ -362,7 +417,20 @@ class FortinetParser(BaseParser):
                 addr["value1"] = self._get_set_value(line)
 
         if addr["name"] and addr["type"] and addr["value1"]:
-            config.addresses.add(Address(**addr))
+            self._add_address(config, Address(**addr))
+
+    def _add_address(self, config: FirewallConfig, address: Address):
+        """Menambahkan Address ke config sekaligus memperbarui indeks value1 (objek pertama yang menang)."""
+        by_value1 = self.address_by_value1
+        replaced = config.addresses.get(address.name)
+        config.addresses.add(address)
+        if replaced is not None and by_value1.get(replaced.value1) is replaced:
+            # Definisi ulang mengganti objek lama: indeksnya dialihkan ke address lain dengan value1 yang sama
+            del by_value1[replaced.value1]
+            other = next((addr for addr in config.addresses if addr.value1 == replaced.value1), None)
+            if other is not None:
+                by_value1[replaced.value1] = other
+        by_value1.setdefault(address.value1, address)
 
     def _parse_address_group_entry(self, entry_lines: List[str], config: FirewallConfig):
         name = self._get_edit_value(entry_lines[0])
@@ -384,6 +452,7 @@ class FortinetParser(BaseParser):
 
     def _parse_service_entry(self, entry_lines: List[str], config: FirewallConfig):
         name = self._get_edit_value(entry_lines[0])
+        original_text = "\n".join(entry_lines)
         svc = {"tcp_port": None, "udp_port": None, "protocol": None}
         for line in entry_lines[1:]:
             if line.startswith("set tcp-portrange"):
@@ -402,12 +471,12 @@ class FortinetParser(BaseParser):
             tcp_port_str = f"eq {svc['tcp_port']}" if '-' not in svc[
                 'tcp_port'] else f"range {svc['tcp_port'].replace('-', ' ')}"
             config.services.add(
-                Service(name=tcp_name, protocol="tcp", port=tcp_port_str, original_text="\n".join(entry_lines)))
+                Service(name=tcp_name, protocol="tcp", port=tcp_port_str, original_text=original_text))
 
             udp_port_str = f"eq {svc['udp_port']}" if '-' not in svc[
                 'udp_port'] else f"range {svc['udp_port'].replace('-', ' ')}"
             config.services.add(
-                Service(name=udp_name, protocol="udp", port=udp_port_str, original_text="\n".join(entry_lines)))
+                Service(name=udp_name, protocol="udp", port=udp_port_str, original_text=original_text))
 
             group_name = f"TCP-UDP_{base_clean_name}"
 
@@ -418,7 +487,7 @@ class FortinetParser(BaseParser):
 
         else:
             final_name = base_clean_name
-            if re.match(r'^\d+$', final_name):
+            if self._RE_NUMERIC.match(final_name):
                 if svc["tcp_port"]:
                     final_name = f"TCP-{final_name}"
                 elif svc["udp_port"]:
@@ -433,57 +502,33 @@ class FortinetParser(BaseParser):
                 port_str = f"eq {svc['tcp_port']}" if '-' not in svc[
                     'tcp_port'] else f"range {svc['tcp_port'].replace('-', ' ')}"
                 config.services.add(
-                    Service(name=final_name, protocol="tcp", port=port_str, original_text="\n".join(entry_lines)))
+                    Service(name=final_name, protocol="tcp", port=port_str, original_text=original_text))
             elif svc["udp_port"]:
                 port_str = f"eq {svc['udp_port']}" if '-' not in svc[
                     'udp_port'] else f"range {svc['udp_port'].replace('-', ' ')}"
                 config.services.add(
-                    Service(name=final_name, protocol="udp", port=port_str, original_text="\n".join(entry_lines)))
+                    Service(name=final_name, protocol="udp", port=port_str, original_text=original_text))
             elif svc["protocol"] == "icmp":
                 config.services.add(
-                    Service(name=final_name, protocol="icmp", port="", original_text="\n".join(entry_lines)))
+                    Service(name=final_name, protocol="icmp", port="", original_text=original_text))
 
     def _parse_policy_entry(self, entry_lines: List[str], config: FirewallConfig, sequence_id: int):
         original_seq_id = self._get_edit_value(entry_lines[0])
+        values = self._collect_set_values(entry_lines, self._POLICY_SET_FIELDS)
+        original_text = "\n".join(entry_lines)
         rule = {
-            "sequence_id": sequence_id, "name": f"Rule_{original_seq_id}", "action": "deny", "enabled": True,
-            "source_interface": set(), "destination_interface": set(),
-            "source": set(), "destination": set(), "service": set(), "remark": None,
-            "original_text": "\n".join(entry_lines), "security_profiles": {}
+            "sequence_id": sequence_id, "name": values.get("name", f"Rule_{original_seq_id}"),
+            "action": "allow" if values.get("action") == "accept" else "deny",
+            "enabled": values.get("status", "enable") == "enable",
+            "source_interface": values.get("source_interface", set()),
+            "destination_interface": values.get("destination_interface", set()),
+            "source": values.get("source") or {"all"}, "destination": values.get("destination") or {"all"},
+            "service": values.get("service") or {"ALL"}, "remark": values.get("remark"),
+            "original_text": original_text,
+            "security_profiles": {key: value for key, value in values.items() if key in ("ips", "av")}
         }
-        is_nat_enabled = False
-        nat_pool_name = None
-        for line in entry_lines[1:]:
-            if line.startswith("set name"):
-                rule["name"] = self._get_set_value(line)
-            elif line.startswith("set srcintf"):
-                rule["source_interface"].update(self._extract_multi_values(line))
-            elif line.startswith("set dstintf"):
-                rule["destination_interface"].update(self._extract_multi_values(line))
-            elif line.startswith("set srcaddr"):
-                rule["source"].update(self._extract_multi_values(line))
-            elif line.startswith("set dstaddr"):
-                rule["destination"].update(self._extract_multi_values(line))
-            elif line.startswith("set service"):
-                rule["service"].update(self._extract_multi_values(line))
-            elif line.startswith("set action"):
-                rule["action"] = "allow" if self._get_set_value(line) == "accept" else "deny"
-            elif line.startswith("set status"):
-                rule["enabled"] = self._get_set_value(line) == "enable"
-            elif line.startswith("set comments"):
-                rule["remark"] = self._get_set_value(line)
-            elif line.startswith("set nat enable"):
-                is_nat_enabled = True
-            elif line.startswith("set poolname"):
-                nat_pool_name = self._get_set_value(line)
-            elif line.startswith("set ips-sensor"):
-                rule["security_profiles"]["ips"] = self._get_set_value(line)
-            elif line.startswith("set av-profile"):
-                rule["security_profiles"]["av"] = self._get_set_value(line)
-
-        if not rule["source"]: rule["source"].add("all")
-        if not rule["destination"]: rule["destination"].add("all")
-        if not rule["service"]: rule["service"].add("ALL")
+        is_nat_enabled = values.get("nat", False)
+        nat_pool_name = values.get("poolname")
 
         config.rules.append(Rule(**rule))
         if is_nat_enabled and nat_pool_name:
@@ -498,39 +543,28 @@ class FortinetParser(BaseParser):
                 destination_interface=rule['destination_interface'],
                 enabled=rule['enabled'],
                 remark=rule['remark'],
-                original_text="\n".join(entry_lines)
+                original_text=original_text
             )
             config.nat_rules.append(nat_rule)
 
     def _parse_vip_entry(self, entry_lines: List[str], config: FirewallConfig, sequence_id: int):
         name = self._get_edit_value(entry_lines[0])
-        vip_data = {
-            "extip": None, "mappedip": None, "is_twice_nat": False,
-            "src_filter": set(), "nat_ippool": None
-        }
-        for line in entry_lines[1:]:
-            if line.startswith("set type twice-nat"):
-                vip_data["is_twice_nat"] = True
-            elif line.startswith("set extip"):
-                vip_data["extip"] = self._get_set_value(line)
-            elif line.startswith("set mappedip"):
-                vip_data["mappedip"] = self._get_set_value(line).split('-')[0].strip()
-            elif line.startswith("set src-filter"):
-                vip_data["src_filter"].update(self._extract_multi_values(line))
-            elif line.startswith("set nat-ippool"):
-                vip_data["nat_ippool"] = self._get_set_value(line)
+        vip_data = {"extip": None, "mappedip": None, "is_twice_nat": False, "src_filter": set(), "nat_ippool": None}
+        vip_data.update(self._collect_set_values(entry_lines, self._VIP_SET_FIELDS))
+        if vip_data["mappedip"] is not None:
+            vip_data["mappedip"] = vip_data["mappedip"].split('-')[0].strip()
         if name and vip_data["extip"] and vip_data["mappedip"]:
             ext_addr_name = name
             mapped_ip = vip_data["mappedip"]
-            mapped_addr_obj = next((addr for addr in config.addresses if addr.value1 == mapped_ip), None)
+            mapped_addr_obj = self.address_by_value1.get(mapped_ip)
             if mapped_addr_obj:
                 mapped_addr_name = mapped_addr_obj.name
             else:
                 mapped_addr_name = f"h-{mapped_ip}"
-                if not any(addr.name == mapped_addr_name for addr in config.addresses):
-                    config.addresses.add(Address(name=mapped_addr_name, type='host', value1=mapped_ip))
-            if not any(addr.name == ext_addr_name for addr in config.addresses):
-                config.addresses.add(Address(name=ext_addr_name, type='host', value1=vip_data["extip"]))
+                if config.addresses.get(mapped_addr_name) is None:
+                    self._add_address(config, Address(name=mapped_addr_name, type='host', value1=mapped_ip))
+            if config.addresses.get(ext_addr_name) is None:
+                self._add_address(config, Address(name=ext_addr_name, type='host', value1=vip_data["extip"]))
 
             original_source = vip_data["src_filter"] if vip_data["is_twice_nat"] else {"all"}
             translated_source = vip_data["nat_ippool"] if vip_data["is_twice_nat"] else None
@@ -548,36 +582,19 @@ class FortinetParser(BaseParser):
 
     def _parse_central_snat_entry(self, entry_lines: List[str], config: FirewallConfig, sequence_id: int):
         original_policy_id = self._get_edit_value(entry_lines[0])
+        values = self._collect_set_values(entry_lines, self._CENTRAL_SNAT_SET_FIELDS)
+        pools = values.get("translated_source")
         nat_rule_data = {
             "sequence_id": sequence_id,
             "name": f"CentralNAT_{original_policy_id}",
-            "original_source": set(),
-            "translated_source": None,
-            "original_destination": set(),
-            "source_interface": set(),
-            "destination_interface": set(),
-            "enabled": True,
-            "remark": None,
+            "original_source": values.get("original_source") or {"all"},
+            "translated_source": " ".join(pools) if pools is not None else None,
+            "original_destination": values.get("original_destination") or {"all"},
+            "source_interface": values.get("source_interface", set()),
+            "destination_interface": values.get("destination_interface", set()),
+            "enabled": values.get("status", "enable") == "enable",
+            "remark": values.get("remark"),
             "original_text": "\n".join(entry_lines)
         }
-        for line in entry_lines[1:]:
-            if line.startswith("set srcintf"):
-                nat_rule_data["source_interface"].update(self._extract_multi_values(line))
-            elif line.startswith("set dstintf"):
-                nat_rule_data["destination_interface"].update(self._extract_multi_values(line))
-            elif line.startswith("set orig-addr"):
-                nat_rule_data["original_source"].update(self._extract_multi_values(line))
-            elif line.startswith("set dst-addr"):
-                nat_rule_data["original_destination"].update(self._extract_multi_values(line))
-            elif line.startswith("set nat-ippool"):
-                pools = self._extract_multi_values(line)
-                nat_rule_data["translated_source"] = " ".join(pools)
-            elif line.startswith("set status"):
-                nat_rule_data["enabled"] = self._get_set_value(line) == "enable"
-            elif line.startswith("set comments"):
-                nat_rule_data["remark"] = self._get_set_value(line)
-
-        if not nat_rule_data["original_source"]: nat_rule_data["original_source"].add("all")
-        if not nat_rule_data["original_destination"]: nat_rule_data["original_destination"].add("all")
-
-        config.nat_rules.append(NatRule(**nat_rule_data))
\ No newline at end of file
+
+        config.nat_rules.append(NatRule(**nat_rule_data))
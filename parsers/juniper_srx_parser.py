@@ -3,7 +3,8 @@
 File ini berisi parser untuk konfigurasi Juniper SRX (format SET).
 """
 import re
-from typing import List, Dict
+import sys
+from typing import List, Dict, Tuple
 
 from models import FirewallConfig, Address, Group, Service, ServiceGroup, Rule, NatRule, StaticRoute, Interface
 from .base import BaseParser
@@ -11,139 +12,158 @@ from .base import BaseParser
 
 class JuniperSrxParser(BaseParser):
     """Parser untuk konfigurasi Juniper SRX."""
-    _RE_STATIC_ROUTE = re.compile(r'set routing-options static route (\S+) next-hop (\S+)')
-    _RE_ADDRESS = re.compile(r'set security address-book \S+ address (\S+) (\S+)')
-    _RE_ADDR_SET = re.compile(r'set security address-book \S+ address-set (\S+) address (\S+)')
-    _RE_APP = re.compile(r'set applications application (\S+) protocol (\S+) destination-port (\S+)')
-    _RE_APP_SET = re.compile(r'set applications application-set (\S+) application (\S+)')
-    _RE_POLICY = re.compile(r'set security policies from-zone (\S+) to-zone (\S+) policy (\S+) match')
-    _RE_INTERFACE = re.compile(r'set interfaces (\S+) unit \d+ family inet address (\S+)')
-    _RE_ZONE_INTERFACE = re.compile(r'set security zones security-zone (\S+) interfaces (\S+)')
+    # Satu regex untuk dispatch sekaligus ekstraksi: nama grup terluar yang cocok (match.lastgroup)
+    # menentukan jenis baris, grup di dalamnya berisi nilai yang dibutuhkan handler.
+    _RE_LINE = re.compile(
+        r'set (?:'
+        r'(?P<address>security address-book \S+ address (?P<addr_name>\S+) (?P<addr_value>\S+))|'
+        r'(?P<address_set>security address-book \S+ address-set (?P<addr_set_name>\S+) address (?P<addr_member>\S+))|'
+        r'(?P<app>applications application (?P<app_name>\S+) protocol (?P<app_protocol>\S+) '
+        r'destination-port (?P<app_port>\S+))|'
+        r'(?P<app_set>applications application-set (?P<app_set_name>\S+) application (?P<app_member>\S+))|'
+        r'(?P<policy>security policies from-zone (?P<from_zone>\S+) to-zone (?P<to_zone>\S+) policy (?P<policy_name>\S+) '
+        r'(?:match\b(?P<policy_match>.*)|then (?P<policy_action>permit|deny)\b))|'
+        r'(?P<nat>security nat (?P<nat_type>source|destination|static) rule-set (?P<rule_set>\S+) rule (?P<nat_rule>\S+) '
+        r'(?P<nat_rest>.*))|'
+        r'(?P<static_route>routing-options static route (?P<route_dst>\S+) next-hop (?P<route_next_hop>\S+))|'
+        r'(?P<interface>interfaces (?P<if_name>\S+) unit \d+ family inet address (?P<if_address>\S+))|'
+        r'(?P<zone>security zones security-zone (?P<zone_name>\S+) interfaces (?P<zone_if>\S+))'
+        r')')
+
+    _RE_THEN = re.compile(r'then (permit|deny)')
+    _RE_NAT_SRC_ADDR = re.compile(r'source-address (\S+)')
+    _RE_NAT_DST_ADDR = re.compile(r'destination-address (\S+)')
+    _RE_SNAT_POOL = re.compile(r'source-nat pool (\S+)')
+    _RE_DNAT_POOL = re.compile(r'destination-nat pool (\S+)')
+    _RE_STATIC_PREFIX = re.compile(r'static-nat prefix (\S+)')
+
+    # Jenis baris (nama grup di _RE_LINE) -> nama method handler
+    _LINE_HANDLERS = {
+        'address': '_parse_address',
+        'address_set': '_parse_address_set',
+        'app': '_parse_app',
+        'app_set': '_parse_app_set',
+        'policy': '_parse_policy_line',
+        'nat': '_parse_nat_rule_line',
+        'static_route': '_parse_static_route',
+        'interface': '_parse_interface',
+        'zone': '_parse_zone_interface',
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.policy_data: Dict[Tuple[str, str, str], Dict] = {}
+        self.nat_rules_data: Dict[Tuple[str, str, str], Dict] = {}
 
     def parse(self, content: str, **kwargs) -> FirewallConfig:
         config = FirewallConfig()
-        lines = [line.strip() for line in content.splitlines() if line.strip()]
-
-        policy_data: Dict[str, Dict] = {}
-        nat_rules_data: Dict[str, Dict] = {}
-
-        # Pass 1: Kumpulkan semua data mentah
-        for line in lines:
-            if line.startswith("set security address-book"):
-                self._parse_address_line(line, config)
-            elif line.startswith("set applications application"):
-                self._parse_app_line(line, config)
-            elif line.startswith("set security policies"):
-                self._parse_policy_line(line, policy_data)
-            elif line.startswith("set security nat"):
-                self._parse_nat_rule_line(line, nat_rules_data)
-            elif line.startswith("set routing-options static route"):
-                self._parse_static_route(line, config)
-            elif line.startswith("set interfaces"):
-                self._parse_interface(line, config)
-            elif line.startswith("set security zones security-zone"):
-                self._parse_zone_interface(line, config)
-
-        self._create_policy_objects(policy_data, config)
-        self._create_nat_rule_objects(nat_rules_data, config)
-
-        return config
+        self.policy_data = {}
+        self.nat_rules_data = {}
+
+        # Pass 1: Kumpulkan semua data mentah (satu regex match per baris)
+        handlers = {kind: getattr(self, method_name) for kind, method_name in self._LINE_HANDLERS.items()}
+        match_line = self._RE_LINE.match
+        for line in content.splitlines():
+            # Baris kosong tidak pernah cocok dengan _RE_LINE, jadi tidak perlu disaring terpisah
+            match = match_line(line.strip())
+            if match is not None:
+                handlers[match.lastgroup](match, config)
+
+        self._create_policy_objects(self.policy_data, config)
+        self._create_nat_rule_objects(self.nat_rules_data, config)
+
+        return self._freeze_members(config)
 
     def _get_quoted_or_unquoted(self, text: str) -> str:
         return text.strip('"')
 
-    def _parse_interface(self, line: str, config: FirewallConfig):
-        match = self._RE_INTERFACE.match(line)
-        if match:
-            if_name, ip_cidr = match.groups()
-            ip, cidr = ip_cidr.split('/')
-
-            iface_obj = next((i for i in config.interfaces if i.name == if_name), None)
-            if not iface_obj:
-                iface_obj = Interface(name=if_name)
-                config.interfaces.add(iface_obj)
-
-            iface_obj.ip_address = ip
-            iface_obj.mask_length = int(cidr)
-
-    def _parse_zone_interface(self, line: str, config: FirewallConfig):
-        match = self._RE_ZONE_INTERFACE.match(line)
-        if match:
-            zone_name, if_name = match.groups()
-            iface_obj = next((i for i in config.interfaces if i.name == if_name), None)
-            if not iface_obj:
-                iface_obj = Interface(name=if_name)
-                config.interfaces.add(iface_obj)
-            iface_obj.zone = zone_name
-
-    def _parse_static_route(self, line: str, config: FirewallConfig):
-        match = self._RE_STATIC_ROUTE.match(line)
-        if match:
-            destination, next_hop = match.groups()
-            route = StaticRoute(destination=destination, next_hop=next_hop)
-            config.static_routes.append(route)
-
-    def _parse_address_line(self, line: str, config: FirewallConfig):
-        addr_match = self._RE_ADDRESS.match(line)
-        if addr_match:
-            name, value = addr_match.groups()
-            if '/' in value:
-                ip, cidr = value.split('/')
-                addr_type = 'host' if cidr == '32' else 'network'
-                config.addresses.add(
-                    Address(name=name, type=addr_type, value1=ip, value2=None if addr_type == 'host' else cidr))
-
-        set_match = self._RE_ADDR_SET.match(line)
-        if set_match:
-            group_name, member_name = set_match.groups()
-            group = next((g for g in config.address_groups if g.name == group_name), None)
-            if not group:
-                group = Group(name=group_name)
-                config.address_groups.add(group)
-            group.members.add(member_name)
-
-    def _parse_app_line(self, line: str, config: FirewallConfig):
-        app_match = self._RE_APP.match(line)
-        if app_match:
-            name, protocol, port = app_match.groups()
-            port_def = f"eq {port}" if '-' not in port else f"range {port.replace('-', ' ')}"
-            config.services.add(Service(name=name, protocol=protocol, port=port_def))
-
-        set_match = self._RE_APP_SET.match(line)
-        if set_match:
-            group_name, member_name = set_match.groups()
-            group = next((g for g in config.service_groups if g.name == group_name), None)
-            if not group:
-                group = ServiceGroup(name=group_name)
-                config.service_groups.add(group)
-            group.members.add(member_name)
-
-    def _parse_policy_line(self, line: str, policy_data: Dict[str, Dict]):
-        match = self._RE_POLICY.match(line)
-        if not match: return
-
-        from_zone, to_zone, name = match.groups()
-        policy_key = f"{from_zone}_{to_zone}_{name}"
+    def _parse_interface(self, match: re.Match, config: FirewallConfig):
+        if_name, ip_cidr = match.group('if_name', 'if_address')
+        ip, _, cidr = ip_cidr.partition('/')
+
+        iface_obj = config.interfaces.get(if_name)
+        if iface_obj is None:
+            iface_obj = Interface(name=if_name)
+            config.interfaces.add(iface_obj)
+
+        iface_obj.ip_address = ip
+        iface_obj.mask_length = int(cidr)
+
+    def _parse_zone_interface(self, match: re.Match, config: FirewallConfig):
+        zone_name, if_name = match.group('zone_name', 'zone_if')
+        zone_name = sys.intern(zone_name)
+        iface_obj = config.interfaces.get(if_name)
+        if iface_obj is None:
+            iface_obj = Interface(name=if_name)
+            config.interfaces.add(iface_obj)
+        iface_obj.zone = zone_name
+
+    def _parse_static_route(self, match: re.Match, config: FirewallConfig):
+        destination, next_hop = match.group('route_dst', 'route_next_hop')
+        route = StaticRoute(destination=destination, next_hop=next_hop)
+        config.static_routes.append(route)
+
+    def _parse_address(self, match: re.Match, config: FirewallConfig):
+        name, value = match.group('addr_name', 'addr_value')
+        ip, sep, cidr = value.partition('/')
+        if sep:
+            addr_type = 'host' if cidr == '32' else 'network'
+            config.addresses.add(
+                Address(name=name, type=addr_type, value1=ip, value2=None if addr_type == 'host' else cidr))
+
+    def _parse_address_set(self, match: re.Match, config: FirewallConfig):
+        group_name, member_name = match.group('addr_set_name', 'addr_member')
+        group = config.address_groups.get(group_name)
+        if group is None:
+            group = Group(name=group_name)
+            config.address_groups.add(group)
+        group.members.add(member_name)
+
+    def _parse_app(self, match: re.Match, config: FirewallConfig):
+        name, protocol, port = match.group('app_name', 'app_protocol', 'app_port')
+        port_def = f"eq {port}" if '-' not in port else f"range {port.replace('-', ' ')}"
+        config.services.add(Service(name=name, protocol=protocol, port=port_def))
+
+    def _parse_app_set(self, match: re.Match, config: FirewallConfig):
+        group_name, member_name = match.group('app_set_name', 'app_member')
+        group = config.service_groups.get(group_name)
+        if group is None:
+            group = ServiceGroup(name=group_name)
+            config.service_groups.add(group)
+        group.members.add(member_name)
+
+    def _parse_policy_line(self, match: re.Match, config: FirewallConfig):
+        policy_data = self.policy_data
+        from_zone, to_zone, name, match_rest, action = match.group('from_zone', 'to_zone', 'policy_name',
+                                                                   'policy_match', 'policy_action')
+        policy_key = (from_zone, to_zone, name)
 
         if policy_key not in policy_data:
-            policy_data[policy_key] = {
+            # Nama zona berulang di ribuan policy; intern agar key dan set zona berbagi satu objek str
+            from_zone, to_zone = sys.intern(from_zone), sys.intern(to_zone)
+            policy_data[(from_zone, to_zone, name)] = {
                 "name": name, "source_interface": {from_zone}, "destination_interface": {to_zone},
                 "source": set(), "destination": set(), "application": set()
             }
 
-        rest_of_line = line.split("match ", 1)[1]
-        parts = rest_of_line.split()
-        if len(parts) >= 2:
-            key = parts[0]
-            values = [v for v in parts[1:] if v not in ['[', ']']]
-            if key in ['source-address', 'destination-address', 'application']:
-                policy_data[policy_key][key.replace('-address', '')].update(values)
+        if match_rest is not None:
+            parts = match_rest.split()
+            if len(parts) >= 2:
+                key = parts[0]
+                if key in ('source-address', 'destination-address', 'application'):
+                    policy_data[policy_key][key.replace('-address', '')].update(
+                        v for v in parts[1:] if v != '[' and v != ']')
 
-        then_match = re.search(r'then (permit|deny)', line)
-        if then_match:
-            policy_data[policy_key]['action'] = "allow" if then_match.group(1) == 'permit' else 'deny'
+            # Aksi kadang ditulis di ujung baris match ('... match application any then permit')
+            if 'then' in match_rest:
+                then_match = self._RE_THEN.search(match_rest)
+                if then_match:
+                    action = then_match.group(1)
 
-    def _create_policy_objects(self, policy_data: Dict[str, Dict], config: FirewallConfig):
+        if action is not None:
+            policy_data[policy_key]['action'] = "allow" if action == 'permit' else 'deny'
+
+    def _create_policy_objects(self, policy_data: Dict[Tuple[str, str, str], Dict], config: FirewallConfig):
         seq_id = 1
         for key, data in policy_data.items():
             rule = Rule(
@@ -159,12 +179,12 @@ class JuniperSrxParser(BaseParser):
             config.rules.append(rule)
             seq_id += 1
 
-    def _parse_nat_rule_line(self, line: str, nat_rules_data: Dict[str, Dict]):
-        match = re.search(r'set security nat (source|destination|static) rule-set (\S+) rule (\S+) (.*)', line)
-        if not match: return
-
-        nat_type, rule_set_name, rule_name, rest_of_line = match.groups()
-        nat_rule_key = f"{nat_type}-{rule_set_name}-{rule_name}"
+    def _parse_nat_rule_line(self, match: re.Match, config: FirewallConfig):
+        line = match.string
+        nat_rules_data = self.nat_rules_data
+        nat_type, rule_set_name, rule_name, rest_of_line = match.group('nat_type', 'rule_set', 'nat_rule', 'nat_rest')
+        # Jenis NAT dan nama rule-set berulang di banyak rule; intern agar key berbagi satu objek str
+        nat_rule_key = (sys.intern(nat_type), sys.intern(rule_set_name), rule_name)
 
         if nat_rule_key not in nat_rules_data:
             nat_rules_data[nat_rule_key] = {"name": f"NAT_{rule_set_name}_{rule_name}", "original_text": [],
@@ -174,24 +194,24 @@ class JuniperSrxParser(BaseParser):
 
         if rest_of_line.startswith("match"):
             if "source-address" in rest_of_line:
-                addr_match = re.search(r'source-address (\S+)', rest_of_line)
+                addr_match = self._RE_NAT_SRC_ADDR.search(rest_of_line)
                 if addr_match: nat_rules_data[nat_rule_key]["original_source"].add(addr_match.group(1))
             elif "destination-address" in rest_of_line:
-                addr_match = re.search(r'destination-address (\S+)', rest_of_line)
+                addr_match = self._RE_NAT_DST_ADDR.search(rest_of_line)
                 if addr_match: nat_rules_data[nat_rule_key]["original_destination"].add(addr_match.group(1))
 
         elif rest_of_line.startswith("then"):
             if nat_type == "source":
-                pool_match = re.search(r'source-nat pool (\S+)', rest_of_line)
+                pool_match = self._RE_SNAT_POOL.search(rest_of_line)
                 if pool_match: nat_rules_data[nat_rule_key]["translated_source"] = pool_match.group(1)
             elif nat_type == "destination":
-                pool_match = re.search(r'destination-nat pool (\S+)', rest_of_line)
+                pool_match = self._RE_DNAT_POOL.search(rest_of_line)
                 if pool_match: nat_rules_data[nat_rule_key]["translated_destination"] = pool_match.group(1)
             elif nat_type == "static":
-                static_match = re.search(r'static-nat prefix (\S+)', rest_of_line)
+                static_match = self._RE_STATIC_PREFIX.search(rest_of_line)
                 if static_match: nat_rules_data[nat_rule_key]["translated_destination"] = static_match.group(1)
 
-    def _create_nat_rule_objects(self, nat_rules_data: Dict[str, Dict], config: FirewallConfig):
+    def _create_nat_rule_objects(self, nat_rules_data: Dict[Tuple[str, str, str], Dict], config: FirewallConfig):
         seq_id = 1
         for key, data in nat_rules_data.items():
             nat_rule = NatRule(
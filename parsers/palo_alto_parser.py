@@ -4,48 +4,92 @@ File ini berisi parser untuk konfigurasi Palo Alto (format SET).
 UPDATED: Added Conversion Warning collection.
 """
 import re
-from typing import List, Dict
+from dataclasses import dataclass, field
+from typing import List, Dict, Set, Optional
 
 from models import FirewallConfig, Address, Group, Service, ServiceGroup, Rule, NatRule, StaticRoute, Interface, ConversionWarning
 from .base import BaseParser
 
 
+@dataclass(slots=True)
+class _RuleData:
+    """Data mentah satu security rule, dikumpulkan dari baris-baris 'set ... security rules <nama> ...'."""
+    original_text: List[str] = field(default_factory=list)
+    source: Optional[Set[str]] = None
+    destination: Optional[Set[str]] = None
+    service: Set[str] = field(default_factory=set)
+    application: Set[str] = field(default_factory=set)
+    source_interface: Set[str] = field(default_factory=set)
+    destination_interface: Set[str] = field(default_factory=set)
+    action: str = 'deny'
+    enabled: bool = True
+    remark: Optional[str] = None
+
+
+@dataclass(slots=True)
+class _NatRuleData:
+    """Data mentah satu NAT rule, dikumpulkan dari baris-baris 'set ... nat rules <nama> ...'."""
+    original_text: List[str] = field(default_factory=list)
+    source: Set[str] = field(default_factory=set)
+    destination: Set[str] = field(default_factory=set)
+    translated_source: Optional[str] = None
+    translated_destination: Optional[str] = None
+    service: Optional[str] = None
+    source_interface: Set[str] = field(default_factory=set)
+    destination_interface: Set[str] = field(default_factory=set)
+    enabled: bool = True
+    remark: Optional[str] = None
+    is_bidirectional: bool = False
+
+
 class PaloAltoSetParser(BaseParser):
     """Parser untuk konfigurasi Palo Alto dalam format perintah 'set'."""
     # Updated Regex: Mendukung nama Device Group dengan spasi (quoted)
     _RE_PANORAMA = re.compile(r'set device-group\s+("[^"]+"|\S+)')
     # Updated Regex: Mendukung nama Template/Vsys dengan spasi, menggunakan non-capturing group (?:...) agar tidak mengacaukan index group regex lain
     _RE_TEMPLATE_VSYS_PREFIX = r'(?:template (?:\"[^\"]+\"|\S+) config devices (?:\"[^\"]+\"|\S+) )?(?:vsys (?:\"[^\"]+\"|\S+) )?'
-
-    # [UPDATED] Regex Address untuk menangkap 'fqdn'
-    _RE_ADDRESS = re.compile(
-        r'set ' + _RE_TEMPLATE_VSYS_PREFIX + r'address ("[^"]+"|(?:[^\s]+))\s+(ip-netmask|ip-range|fqdn)\s+(.*)')
-    _RE_SERVICE = re.compile(
-        r'set ' + _RE_TEMPLATE_VSYS_PREFIX + r'service ("[^"]+"|[\w.-]+) protocol (tcp|udp) port ([\d-]+)')
-    _RE_ADDR_GROUP = re.compile(
-        r'set ' + _RE_TEMPLATE_VSYS_PREFIX + r'address-group ("[^"]+"|[\w.-]+) static \[\s*(.*?)\s*\]')
-    _RE_SVC_GROUP = re.compile(
-        r'set ' + _RE_TEMPLATE_VSYS_PREFIX + r'service-group ("[^"]+"|[\w.-]+) members \[\s*(.*?)\s*\]')
-    _RE_SEC_RULE = re.compile(
-        r'set ' + _RE_TEMPLATE_VSYS_PREFIX + r'(?:pre-rulebase|post-rulebase|rulebase) security rules ("[^"]+"|[\w.-]+) ([\w-]+) (.*)')
-    _RE_NAT_RULE = re.compile(
-        r'set ' + _RE_TEMPLATE_VSYS_PREFIX + r'(?:pre-rulebase|post-rulebase|rulebase) nat rules ("[^"]+"|[\w.-]+) ([\w-]+) (.*)')
-    _RE_ZONE = re.compile(r'set ' + _RE_TEMPLATE_VSYS_PREFIX + r'network zone ("[^"]+"|[\w.-]+)')
-    _RE_INTERFACE = re.compile(
-        r'set ' + _RE_TEMPLATE_VSYS_PREFIX + r'network interface ethernet ("[^"]+"|[\w.-/]+) layer3 (.*)')
-
-    # FIX: Regex Route yang lebih fleksibel untuk menangkap nama route dulu
-    _RE_STATIC_ROUTE_BASE = re.compile(
-        r'set ' + _RE_TEMPLATE_VSYS_PREFIX + r'network virtual-router (\S+) routing-table ip static-route ("[^"]+"|[\w.-]+) (.*)')
+    # Prefix template/vsys hanya dicoba untuk baris yang memang diawali kata kunci tersebut,
+    # sehingga _RE_LINE sendiri tidak membawa grup opsional di depannya.
+    _RE_SCOPE_PREFIX = re.compile(_RE_TEMPLATE_VSYS_PREFIX)
+    _SCOPE_KEYWORDS = ('template ', 'vsys ')
+
+    # Nama objek: quoted (boleh berisi spasi) atau token biasa
+    _RE_OBJ_NAME = r'"[^"]+"|[\w.-]+'
+    # Satu regex untuk dispatch sekaligus ekstraksi: nama grup terluar yang cocok (match.lastgroup)
+    # menentukan jenis baris, grup di dalamnya berisi nilai yang dibutuhkan handler.
+    # Dicocokkan mulai dari posisi setelah 'set ' dan prefix template/vsys (lihat parse()).
+    # Urutan alternatif sama dengan urutan pengecekan if/elif sebelumnya.
+    # [UPDATED] Address menangkap 'fqdn'; FIX: static route menangkap nama route dulu
+    _RE_LINE = re.compile(
+        r'(?:'
+        r'(?P<address>address (?P<addr_name>"[^"]+"|[^\s]+)\s+(?P<addr_type>ip-netmask|ip-range|fqdn)\s+(?P<addr_value>.*))|'
+        r'(?P<service>service (?P<svc_name>' + _RE_OBJ_NAME + r') protocol (?P<svc_protocol>tcp|udp) port (?P<svc_port>[\d-]+))|'
+        r'(?P<addr_group>address-group (?P<addr_group_name>' + _RE_OBJ_NAME + r') static \[\s*(?P<addr_group_members>.*?)\s*\])|'
+        r'(?P<svc_group>service-group (?P<svc_group_name>' + _RE_OBJ_NAME + r') members \[\s*(?P<svc_group_members>.*?)\s*\])|'
+        r'(?P<zone>network zone (?P<zone_name>' + _RE_OBJ_NAME + r'))|'
+        r'(?P<interface>network interface ethernet (?P<if_name>"[^"]+"|[\w.-/]+) layer3 (?P<if_rest>.*))|'
+        r'(?P<static_route>network virtual-router (?P<vr_name>\S+) routing-table ip static-route '
+        r'(?P<route_name>' + _RE_OBJ_NAME + r') (?P<route_rest>.*))|'
+        r'(?P<sec_rule>(?:pre-rulebase|post-rulebase|rulebase) security rules (?P<rule_name>' + _RE_OBJ_NAME + r') '
+        r'(?P<rule_key>[\w-]+) (?P<rule_value>.*))|'
+        r'(?P<nat_rule>(?:pre-rulebase|post-rulebase|rulebase) nat rules (?P<nat_name>' + _RE_OBJ_NAME + r') '
+        r'(?P<nat_key>[\w-]+) (?P<nat_value>.*))'
+        r')')
 
     _RE_NAT_TRANS = re.compile(
         r'static-ip\s+.*translated-address\s+("[^"]+"|[\w.-]+)|'
         r'dynamic-ip-and-port\s+.*address\s+("[^"]+"|[\w.-]+)|'
         r'dynamic-ip-and-port\s+.*interface-address\s+.*interface\s+("[^"]+"|[\w.-]+)'
     )
+    _RE_IF_IP = re.compile(r'ip\s+\[\s*(\S+)\s*\]')
+    _RE_IF_COMMENT = re.compile(r'comment\s+(\S+)')
+    # Sub-key static route di awal sisa baris (setelah nama route)
+    _RE_ROUTE_FIELDS = re.compile(r'(destination|nexthop ip-address|nexthop next-vr|interface|metric)\s+(.*)')
     _RE_NAT_DEST_TRANS = re.compile(r'translated-address ("[^"]+"|[\w.-]+)')
     _RE_IS_IP = re.compile(r"^\d{1,3}(\.\d{1,3}){3}$")
     _RE_MEMBER_PARSER = re.compile(r'"[^"]+"|\S+')
+    # Baris konfigurasi non-policy yang sengaja diabaikan tanpa ConversionWarning
+    _RE_NOISE = re.compile(r'set (?:cli|mgt-config|deviceconfig|network profiles|shared)\b')
 
     _DEFAULT_SERVICES = {
         "service-http": Service(name="service-http", protocol="tcp", port="eq 80"),
@@ -54,71 +98,99 @@ class PaloAltoSetParser(BaseParser):
         "service-ssh": Service(name="service-ssh", protocol="tcp", port="eq 22"),
     }
 
+    # Jenis baris (nama grup di _RE_LINE) -> nama method handler
+    _LINE_HANDLERS = {
+        'address': '_parse_address',
+        'service': '_parse_service',
+        'addr_group': '_parse_address_group',
+        'svc_group': '_parse_service_group',
+        'zone': '_parse_zone',
+        'interface': '_parse_interface_line',
+        'static_route': '_parse_static_route_line',
+        'sec_rule': '_parse_rule_line',
+        'nat_rule': '_parse_nat_rule_line',
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.rules_data: Dict[str, _RuleData] = {}
+        self.nat_rules_data: Dict[str, _NatRuleData] = {}
+        self.interface_data: Dict[str, Dict] = {}
+        self.routes_data: Dict[str, Dict] = {}
+
     def parse(self, content: str, **kwargs) -> FirewallConfig:
         config = FirewallConfig()
-        lines = [line.strip() for line in content.splitlines() if line.strip() and not line.strip().startswith('#')]
-
-        rules_data: Dict[str, Dict] = {}
-        nat_rules_data: Dict[str, Dict] = {}
-        interface_data: Dict[str, Dict] = {}
-        routes_data: Dict[str, Dict] = {}
-
-        for line in lines:
-            panorama_match = self._RE_PANORAMA.match(line)
-            if panorama_match:
-                line_without_dg = line[len(panorama_match.group(0)):].strip()
-                processed_line = "set {}".format(line_without_dg)
-            else:
-                processed_line = line
-
-            if self._RE_ADDRESS.match(processed_line):
-                self._parse_address(processed_line, config)
-            elif self._RE_SERVICE.match(processed_line):
-                self._parse_service(processed_line, config)
-            elif self._RE_ADDR_GROUP.match(processed_line):
-                self._parse_address_group(processed_line, config)
-            elif self._RE_SVC_GROUP.match(processed_line):
-                self._parse_service_group(processed_line, config)
-            elif self._RE_ZONE.match(processed_line):
-                self._parse_zone(processed_line, config)
-            elif self._RE_INTERFACE.match(processed_line):
-                self._parse_interface_line(processed_line, interface_data)
-            elif self._RE_STATIC_ROUTE_BASE.match(processed_line):
-                self._parse_static_route_line(processed_line, routes_data)
-            elif self._RE_SEC_RULE.match(processed_line):
-                self._parse_rule_line(processed_line, rules_data, config)
-            elif self._RE_NAT_RULE.match(processed_line):
-                self._parse_nat_rule_line(processed_line, nat_rules_data, config)
-            
+
+        self.rules_data = {}
+        self.nat_rules_data = {}
+        self.interface_data = {}
+        self.routes_data = {}
+
+        handlers = {kind: getattr(self, method_name) for kind, method_name in self._LINE_HANDLERS.items()}
+        match_panorama = self._RE_PANORAMA.match
+        match_line = self._RE_LINE.match
+        match_scope = self._RE_SCOPE_PREFIX.match
+        scope_keywords = self._SCOPE_KEYWORDS
+        match_noise = self._RE_NOISE.match
+        # Baris di-strip satu per satu saat iterasi, tanpa list kedua berisi semua baris yang sudah di-strip
+        for line in content.splitlines():
+            line = line.strip()
+            if not line or line[0] == '#':
+                continue
+
+            # Regex Panorama hanya dijalankan untuk baris device-group; baris lain dipakai apa adanya
+            processed_line = line
+            if line.startswith('set device-group'):
+                panorama_match = match_panorama(line)
+                if panorama_match:
+                    processed_line = 'set ' + line[panorama_match.end():].strip()
+
+            # Satu regex match per baris; handler menerima Match object (tanpa search ulang).
+            # match.string tetap baris utuh, jadi handler masih bisa memakai seluruh baris.
+            match = None
+            if processed_line.startswith('set '):
+                pos = 4
+                if processed_line.startswith(scope_keywords, 4):
+                    pos = match_scope(processed_line, 4).end()
+                match = match_line(processed_line, pos)
+            if match is not None:
+                handlers[match.lastgroup](match, config)
+
             # --- [NEW] Catch Unparsed Lines ---
             else:
                 # Filter out common noise
-                if not any(k in processed_line for k in ['set cli', 'set mgt-config', 'set deviceconfig', 'set network profiles', 'set shared']):
+                if not match_noise(processed_line):
                     config.conversion_warnings.append(ConversionWarning(
                         category='Parser', message='Skipped unparsed line', original_line=line, severity='info'
                     ))
 
-        self._create_interface_objects(interface_data, config)
-        self._create_rule_objects(rules_data, config)
-        self._create_nat_rule_objects(nat_rules_data, config)
-        self._create_route_objects(routes_data, config)
+        self._create_interface_objects(self.interface_data, config)
+        self._create_rule_objects(self.rules_data, config)
+        self._create_nat_rule_objects(self.nat_rules_data, config)
+        self._create_route_objects(self.routes_data, config)
 
-        return config
+        return self._freeze_members(config)
 
     def _is_ip_address(self, value: str) -> bool:
-        if not value: return False
-        return bool(self._RE_IS_IP.match(value))
+        # Nama objek (LAN, any, h-...) hampir tidak pernah diawali angka: tolak tanpa menjalankan regex
+        if not value[:1].isdigit(): return False
+        return self._RE_IS_IP.match(value) is not None
 
     def _get_quoted_or_unquoted(self, text: str) -> str:
         return text.strip('"')
 
+    def _split_members(self, members_str: str) -> Set[str]:
+        """Memecah daftar member '[ a b "c d" ]' (tanpa kurung) menjadi set nama tanpa tanda kutip."""
+        # Kasus umum tanpa nama quoted: split() menghasilkan token yang sama dengan _RE_MEMBER_PARSER
+        if '"' not in members_str:
+            return set(members_str.split())
+        return {self._get_quoted_or_unquoted(m) for m in self._RE_MEMBER_PARSER.findall(members_str)}
+
     def _ensure_default_service_exists(self, service_name: str, config: FirewallConfig):
-        if service_name in self._DEFAULT_SERVICES:
-            existing_service_names = {s.name for s in config.services}
-            if service_name not in existing_service_names:
-                config.services.add(self._DEFAULT_SERVICES[service_name])
+        if service_name in self._DEFAULT_SERVICES and config.services.get(service_name) is None:
+            config.services.add(self._DEFAULT_SERVICES[service_name])
 
-    def _parse_zone(self, line: str, config: FirewallConfig):
+    def _parse_zone(self, match: re.Match, config: FirewallConfig):
         # KITA NONAKTIFKAN FUNGSI INI AGAR ZONE TIDAK MASUK KE DAFTAR INTERFACE
         pass
 
@@ -128,26 +200,24 @@ class PaloAltoSetParser(BaseParser):
         #     zone_name = self._get_quoted_or_unquoted(match.group(1))
         #     config.interfaces.add(Interface(name=zone_name, zone=zone_name))
 
-    def _parse_interface_line(self, line: str, interface_data: Dict[str, Dict]):
-        match = self._RE_INTERFACE.search(line)
-        if not match: return
-
-        if_name = self._get_quoted_or_unquoted(match.group(1))
-        rest_of_line = match.group(2)
+    def _parse_interface_line(self, match: re.Match, config: FirewallConfig):
+        interface_data = self.interface_data
+        if_name = self._get_quoted_or_unquoted(match.group('if_name'))
+        rest_of_line = match.group('if_rest')
 
         if if_name not in interface_data:
             interface_data[if_name] = {}
 
         if " ip " in rest_of_line:
-            ip_match = re.search(r'ip\s+\[\s*(\S+)\s*\]', rest_of_line)
+            ip_match = self._RE_IF_IP.search(rest_of_line)
             if ip_match:
                 ip_cidr = ip_match.group(1)
-                if '/' in ip_cidr:
-                    ip, cidr = ip_cidr.split('/')
+                ip, sep, cidr = ip_cidr.partition('/')
+                if sep:
                     interface_data[if_name]['ip_address'] = ip
                     interface_data[if_name]['mask_length'] = int(cidr)
         elif " comment " in rest_of_line:
-            comment_match = re.search(r'comment\s+(\S+)', rest_of_line)
+            comment_match = self._RE_IF_COMMENT.search(rest_of_line)
             if comment_match:
                 interface_data[if_name]['description'] = self._get_quoted_or_unquoted(comment_match.group(1))
 
@@ -156,13 +226,11 @@ class PaloAltoSetParser(BaseParser):
             iface = Interface(name=name, zone=name, **data)
             config.interfaces.add(iface)
 
-    def _parse_static_route_line(self, line: str, routes_data: Dict[str, Dict]):
-        match = self._RE_STATIC_ROUTE_BASE.search(line)
-        if not match: return
-
-        vr_name = match.group(1)
-        route_name = self._get_quoted_or_unquoted(match.group(2))
-        remainder = match.group(3)
+    def _parse_static_route_line(self, match: re.Match, config: FirewallConfig):
+        routes_data = self.routes_data
+        vr_name = match.group('vr_name')
+        route_name = self._get_quoted_or_unquoted(match.group('route_name'))
+        remainder = match.group('route_rest')
 
         unique_key = f"{vr_name}::{route_name}"
 
@@ -175,27 +243,24 @@ class PaloAltoSetParser(BaseParser):
                 "comment": None
             }
 
-        if remainder.startswith("destination "):
-            routes_data[unique_key]["destination"] = remainder.replace("destination ", "").strip()
-        elif "nexthop ip-address" in remainder:
-            parts = remainder.split("nexthop ip-address")
-            if len(parts) > 1:
-                routes_data[unique_key]["next_hop"] = parts[1].strip()
-        elif "interface" in remainder and "nexthop" not in remainder:
-            parts = remainder.split("interface")
-            if len(parts) > 1:
-                routes_data[unique_key]["interface"] = parts[1].strip()
-        elif "nexthop next-vr" in remainder:
-            parts = remainder.split("nexthop next-vr")
-            if len(parts) > 1:
-                routes_data[unique_key]["next_hop"] = f"VR:{parts[1].strip()}"
-        elif "metric" in remainder:
-            parts = remainder.split("metric")
-            if len(parts) > 1:
-                try:
-                    routes_data[unique_key]["distance"] = int(parts[1].strip())
-                except:
-                    pass
+        field_match = self._RE_ROUTE_FIELDS.match(remainder)
+        if not field_match: return
+        field, value = field_match.group(1), field_match.group(2).strip()
+        route = routes_data[unique_key]
+
+        if field == "destination":
+            route["destination"] = value
+        elif field == "nexthop ip-address":
+            route["next_hop"] = value
+        elif field == "nexthop next-vr":
+            route["next_hop"] = f"VR:{value}"
+        elif field == "interface":
+            route["interface"] = value
+        else:
+            try:
+                route["distance"] = int(value)
+            except ValueError:
+                pass
 
     def _create_route_objects(self, routes_data: Dict[str, Dict], config: FirewallConfig):
         for key, data in routes_data.items():
@@ -208,152 +273,142 @@ class PaloAltoSetParser(BaseParser):
                 )
                 config.static_routes.append(route)
 
-    def _parse_address(self, line: str, config: FirewallConfig):
-        match = self._RE_ADDRESS.search(line)
-        if not match: return
-        name = self._get_quoted_or_unquoted(match.group(1))
-        addr_type = match.group(2)
-        value = match.group(3).strip()
+    def _parse_address(self, match: re.Match, config: FirewallConfig):
+        name = self._get_quoted_or_unquoted(match.group('addr_name'))
+        addr_type = match.group('addr_type')
+        value = match.group('addr_value').strip()
         if addr_type == 'ip-netmask':
-            if '/' in value:
-                ip, cidr = value.split('/')
-                if cidr == '32':
-                    config.addresses.add(Address(name=name, type='host', value1=ip))
-                else:
-                    config.addresses.add(Address(name=name, type='network', value1=ip, value2=cidr))
+            # Tanpa '/' partition mengembalikan seluruh nilai sebagai ip
+            ip, sep, cidr = value.partition('/')
+            if sep and cidr != '32':
+                config.addresses.add(Address(name=name, type='network', value1=ip, value2=cidr))
             else:
-                config.addresses.add(Address(name=name, type='host', value1=value))
+                config.addresses.add(Address(name=name, type='host', value1=ip))
         elif addr_type == 'ip-range':
-            if '-' in value:
-                val1, val2 = value.split('-')
+            val1, sep, val2 = value.partition('-')
+            if sep:
                 config.addresses.add(Address(name=name, type='range', value1=val1, value2=val2))
         elif addr_type == 'fqdn':
             # [NEW] Support for FQDN
             config.addresses.add(Address(name=name, type='fqdn', value1=self._get_quoted_or_unquoted(value)))
 
-    def _parse_service(self, line: str, config: FirewallConfig):
-        match = self._RE_SERVICE.search(line)
-        if match:
-            name = self._get_quoted_or_unquoted(match.group(1))
-            protocol = match.group(2)
-            port = match.group(3)
-            port_def = "eq {}".format(port) if '-' not in port else "range {}".format(port.replace('-', ' '))
-            config.services.add(Service(name=name, protocol=protocol, port=port_def))
-
-    def _parse_address_group(self, line: str, config: FirewallConfig):
-        match = self._RE_ADDR_GROUP.search(line)
-        if match:
-            name = self._get_quoted_or_unquoted(match.group(1))
-            members_str = match.group(2)
-            members = {self._get_quoted_or_unquoted(m) for m in self._RE_MEMBER_PARSER.findall(members_str)}
-            config.address_groups.add(Group(name=name, members=members))
-
-    def _parse_service_group(self, line: str, config: FirewallConfig):
-        match = self._RE_SVC_GROUP.search(line)
-        if match:
-            name = self._get_quoted_or_unquoted(match.group(1))
-            members_str = match.group(2)
-            members = {self._get_quoted_or_unquoted(m) for m in self._RE_MEMBER_PARSER.findall(members_str)}
-            for member_name in members:
-                self._ensure_default_service_exists(member_name, config)
-            config.service_groups.add(ServiceGroup(name=name, members=members))
-
-    def _parse_rule_line(self, line: str, rules_data: Dict[str, Dict], config: FirewallConfig):
-        match = self._RE_SEC_RULE.search(line)
-        if not match: return
-        rule_name = self._get_quoted_or_unquoted(match.group(1))
-        key = match.group(2)
-        value_str = match.group(3)
-        if rule_name not in rules_data:
-            rules_data[rule_name] = {
-                "original_text": [], "service": set(), "application": set(),
-                "source_interface": set(), "destination_interface": set()
-            }
-        rules_data[rule_name]["original_text"].append(line)
+    def _parse_service(self, match: re.Match, config: FirewallConfig):
+        name = self._get_quoted_or_unquoted(match.group('svc_name'))
+        protocol, port = match.group('svc_protocol', 'svc_port')
+        port_def = "eq {}".format(port) if '-' not in port else "range {}".format(port.replace('-', ' '))
+        config.services.add(Service(name=name, protocol=protocol, port=port_def))
+
+    def _parse_address_group(self, match: re.Match, config: FirewallConfig):
+        name = self._get_quoted_or_unquoted(match.group('addr_group_name'))
+        members_str = match.group('addr_group_members')
+        members = self._split_members(members_str)
+        config.address_groups.add(Group(name=name, members=members))
+
+    def _parse_service_group(self, match: re.Match, config: FirewallConfig):
+        name = self._get_quoted_or_unquoted(match.group('svc_group_name'))
+        members_str = match.group('svc_group_members')
+        members = self._split_members(members_str)
+        for member_name in members:
+            self._ensure_default_service_exists(member_name, config)
+        config.service_groups.add(ServiceGroup(name=name, members=members))
+
+    def _parse_rule_line(self, match: re.Match, config: FirewallConfig):
+        line = match.string
+        rules_data = self.rules_data
+        rule_name = self._get_quoted_or_unquoted(match.group('rule_name'))
+        key, value_str = match.group('rule_key', 'rule_value')
+        rule_data = rules_data.get(rule_name)
+        if rule_data is None:
+            rule_data = rules_data[rule_name] = _RuleData()
+        rule_data.original_text.append(line)
         if key == 'from' or key == 'to':
-            interface_key = 'source_interface' if key == 'from' else 'destination_interface'
             value_str_cleaned = value_str.strip('[ ]')
-            members = {self._get_quoted_or_unquoted(m) for m in self._RE_MEMBER_PARSER.findall(value_str_cleaned)}
-            rules_data[rule_name][interface_key].update(members)
-        elif key in ['source', 'destination', 'service', 'application']:
+            members = self._split_members(value_str_cleaned)
+            if key == 'from':
+                rule_data.source_interface.update(members)
+            else:
+                rule_data.destination_interface.update(members)
+        elif key in {'source', 'destination', 'service', 'application'}:
             value_str_cleaned = value_str.strip('[ ]')
-            members = {self._get_quoted_or_unquoted(m) for m in self._RE_MEMBER_PARSER.findall(value_str_cleaned)}
+            members = self._split_members(value_str_cleaned)
             if key == 'service':
                 if value_str.strip() == 'application-default':
-                    rules_data[rule_name]['service'].add('application-default')
+                    rule_data.service.add('application-default')
                 else:
                     for member_name in members:
                         self._ensure_default_service_exists(member_name, config)
-                    rules_data[rule_name]['service'].update(members)
+                    rule_data.service.update(members)
             elif key == 'application':
-                rules_data[rule_name]['application'].update(members)
+                rule_data.application.update(members)
+            elif key == 'source':
+                rule_data.source = members
             else:
-                rules_data[rule_name][key] = members
+                rule_data.destination = members
         elif key == 'disabled' and value_str == 'yes':
-            rules_data[rule_name]['enabled'] = False
+            rule_data.enabled = False
         elif key == 'description':
-            rules_data[rule_name]['remark'] = self._get_quoted_or_unquoted(value_str)
-        else:
-            rules_data[rule_name][key] = value_str
+            rule_data.remark = self._get_quoted_or_unquoted(value_str)
+        elif key == 'action':
+            # Key lain (profile-setting, log-end, dst.) tidak dipakai saat membuat Rule
+            rule_data.action = value_str
 
-    def _create_rule_objects(self, rules_data: Dict[str, Dict], config: FirewallConfig):
+    def _create_rule_objects(self, rules_data: Dict[str, _RuleData], config: FirewallConfig):
         seq_id = 1
         for name, data in rules_data.items():
-            action = data.get('action', 'deny')
             rule = Rule(
                 sequence_id=seq_id,
                 name=name,
-                action="allow" if action == "allow" else "deny",
-                source=data.get('source', {'any'}),
-                destination=data.get('destination', {'any'}),
-                service=data.get('service', {'any'}),
-                application=data.get('application', set()),
-                source_interface=data.get('source_interface') or {'any'},
-                destination_interface=data.get('destination_interface') or {'any'},
-                enabled=data.get('enabled', True),
-                remark=data.get('remark'),
-                original_text="\n".join(data.get("original_text", []))
+                action="allow" if data.action == "allow" else "deny",
+                source=data.source if data.source is not None else {'any'},
+                destination=data.destination if data.destination is not None else {'any'},
+                service=data.service,
+                application=data.application,
+                source_interface=data.source_interface or {'any'},
+                destination_interface=data.destination_interface or {'any'},
+                enabled=data.enabled,
+                remark=data.remark,
+                original_text="\n".join(data.original_text)
             )
             config.rules.append(rule)
             seq_id += 1
 
-    def _parse_nat_rule_line(self, line: str, nat_rules_data: Dict[str, Dict], config: FirewallConfig):
-        match = self._RE_NAT_RULE.search(line)
-        if not match: return
-        rule_name = self._get_quoted_or_unquoted(match.group(1))
-        key = match.group(2)
-        value_str = match.group(3).strip()
-        if rule_name not in nat_rules_data:
-            nat_rules_data[rule_name] = {
-                "original_text": [], "source": set(), "translated_source": None,
-                "destination": set(), "translated_destination": None, "service": None,
-                "source_interface": set(), "destination_interface": set(),
-                "enabled": True, "remark": None
-            }
-        nat_rules_data[rule_name]["original_text"].append(line)
-        if key in ['source', 'destination']:
+    def _parse_nat_rule_line(self, match: re.Match, config: FirewallConfig):
+        line = match.string
+        nat_rules_data = self.nat_rules_data
+        rule_name = self._get_quoted_or_unquoted(match.group('nat_name'))
+        key = match.group('nat_key')
+        value_str = match.group('nat_value').strip()
+        rule_data = nat_rules_data.get(rule_name)
+        if rule_data is None:
+            rule_data = nat_rules_data[rule_name] = _NatRuleData()
+        rule_data.original_text.append(line)
+        if key == 'source' or key == 'destination':
             members_str = value_str.strip('[ ]')
             final_members = set()
-            for m_str in self._RE_MEMBER_PARSER.findall(members_str):
-                member_name = self._get_quoted_or_unquoted(m_str)
+            for member_name in self._split_members(members_str):
                 if self._is_ip_address(member_name):
                     obj_name = "h-{}".format(member_name)
-                    if not any(addr.name == obj_name for addr in config.addresses):
+                    if config.addresses.get(obj_name) is None:
                         config.addresses.add(Address(name=obj_name, type='host', value1=member_name))
                     final_members.add(obj_name)
                 else:
                     final_members.add(member_name)
-            nat_rules_data[rule_name][key] = final_members
+            if key == 'source':
+                rule_data.source = final_members
+            else:
+                rule_data.destination = final_members
         elif key == 'from' or key == 'to':
-            interface_key = 'source_interface' if key == 'from' else 'destination_interface'
             value_str_cleaned = value_str.strip('[ ]')
-            members = {self._get_quoted_or_unquoted(m) for m in self._RE_MEMBER_PARSER.findall(value_str_cleaned)}
-            nat_rules_data[rule_name][interface_key].update(members)
+            members = self._split_members(value_str_cleaned)
+            if key == 'from':
+                rule_data.source_interface.update(members)
+            else:
+                rule_data.destination_interface.update(members)
         elif key == 'service':
-            nat_rules_data[rule_name]['service'] = self._get_quoted_or_unquoted(value_str)
+            rule_data.service = self._get_quoted_or_unquoted(value_str)
         elif key == 'source-translation':
             if 'bi-directional yes' in value_str:
-                nat_rules_data[rule_name]['is_bidirectional'] = True
+                rule_data.is_bidirectional = True
             translation_match = self._RE_NAT_TRANS.search(value_str)
             if translation_match:
                 static_ip_val, dynamic_ip_addr_val, interface_addr = translation_match.groups()
@@ -365,63 +420,63 @@ class PaloAltoSetParser(BaseParser):
                 if value_to_process:
                     if self._is_ip_address(value_to_process):
                         obj_name = "h-{}".format(value_to_process)
-                        if not any(addr.name == obj_name for addr in config.addresses):
+                        if config.addresses.get(obj_name) is None:
                             config.addresses.add(Address(name=obj_name, type='host', value1=value_to_process))
-                        nat_rules_data[rule_name]['translated_source'] = obj_name
+                        rule_data.translated_source = obj_name
                     else:
-                        nat_rules_data[rule_name]['translated_source'] = value_to_process
+                        rule_data.translated_source = value_to_process
                 elif interface_addr:
-                    nat_rules_data[rule_name]['translated_source'] = 'dynamic-ip-and-port'
+                    rule_data.translated_source = 'dynamic-ip-and-port'
             elif 'dynamic-ip-and-port' in value_str:
-                nat_rules_data[rule_name]['translated_source'] = 'dynamic-ip-and-port'
+                rule_data.translated_source = 'dynamic-ip-and-port'
         elif key == 'destination-translation':
             trans_addr_match = self._RE_NAT_DEST_TRANS.search(value_str)
             if trans_addr_match:
                 value = self._get_quoted_or_unquoted(trans_addr_match.group(1))
                 if self._is_ip_address(value):
                     obj_name = "h-{}".format(value)
-                    if not any(addr.name == obj_name for addr in config.addresses):
+                    if config.addresses.get(obj_name) is None:
                         config.addresses.add(Address(name=obj_name, type='host', value1=value))
-                    nat_rules_data[rule_name]['translated_destination'] = obj_name
+                    rule_data.translated_destination = obj_name
                 else:
-                    nat_rules_data[rule_name]['translated_destination'] = value
+                    rule_data.translated_destination = value
         elif key == 'disabled' and value_str == 'yes':
-            nat_rules_data[rule_name]['enabled'] = False
+            rule_data.enabled = False
         elif key == 'description':
-            nat_rules_data[rule_name]['remark'] = self._get_quoted_or_unquoted(value_str)
+            rule_data.remark = self._get_quoted_or_unquoted(value_str)
 
-    def _create_nat_rule_objects(self, nat_rules_data: Dict[str, Dict], config: FirewallConfig):
+    def _create_nat_rule_objects(self, nat_rules_data: Dict[str, _NatRuleData], config: FirewallConfig):
         seq_id = 1
         final_nat_rules = []
         for name, data in nat_rules_data.items():
-            translated_source = data.get('translated_source') or None
-            translated_destination = data.get('translated_destination') or None
+            translated_source = data.translated_source or None
+            translated_destination = data.translated_destination or None
             primary_rule = NatRule(
                 sequence_id=seq_id, name=name,
-                original_source=data.get('source') or {'any'},
+                original_source=data.source or {'any'},
                 translated_source=translated_source,
-                original_destination=data.get('destination') or {'any'},
+                original_destination=data.destination or {'any'},
                 translated_destination=translated_destination,
-                original_service={data.get('service') or 'any'},
-                source_interface=data.get('source_interface') or {'any'},
-                destination_interface=data.get('destination_interface') or {'any'},
-                enabled=data.get('enabled', True), remark=data.get('remark'),
-                original_text="\n".join(data.get("original_text", []))
+                original_service={data.service or 'any'},
+                source_interface=data.source_interface or {'any'},
+                destination_interface=data.destination_interface or {'any'},
+                enabled=data.enabled, remark=data.remark,
+                original_text="\n".join(data.original_text)
             )
             final_nat_rules.append(primary_rule)
             seq_id += 1
-            if data.get('is_bidirectional') and translated_source and data.get('source'):
-                original_source_members = data.get('source')
+            if data.is_bidirectional and translated_source and data.source:
+                original_source_members = data.source
                 if original_source_members:
                     internal_object_name = list(original_source_members)[0]
                     dnat_rule = NatRule(
                         sequence_id=seq_id, name="DNAT_of_{}".format(name),
                         original_source={'any'}, original_destination={translated_source},
                         translated_destination=internal_object_name, translated_source=None,
-                        original_service={data.get('service') or 'any'},
-                        source_interface=data.get('destination_interface') or {'any'},
-                        destination_interface=data.get('source_interface') or {'any'},
-                        enabled=data.get('enabled', True),
+                        original_service={data.service or 'any'},
+                        source_interface=data.destination_interface or {'any'},
+                        destination_interface=data.source_interface or {'any'},
+                        enabled=data.enabled,
                         remark="Auto-generated DNAT for bi-directional rule {}".format(name),
                         original_text=primary_rule.original_text
                     )
@@ -0,0 +1,97 @@
+"""
+Stream release checks for CheckpointCSVParser.
+
+Run from the repository root: python -m unittest discover -s tests
+"""
+import gc
+import io
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+from models import FirewallConfig
+from parsers.checkpoint_csv_parser import CheckpointCSVParser
+
+GOOD = {
+    'parse_hosts': "name,ipv4-address\nh1,1.1.1.1\n",
+    'parse_networks': "name,subnet4,mask-length4\nn1,10.0.0.0,8\n",
+    'parse_address_ranges': "name,ipv4-address-first,ipv4-address-last\nr1,1.1.1.1,1.1.1.2\n",
+    'parse_tcp_services': "name,port\nt1,80\n",
+    'parse_udp_services': "name,port\nu1,53\n",
+    'parse_groups': "name,members.0\ng1,h1\n",
+    'parse_service_groups': "name,members.0\ng1,t1\n",
+}
+
+
+def _object_count(config):
+    return (len(config.addresses) + len(config.services)
+            + len(config.address_groups) + len(config.service_groups))
+
+
+class StreamReleaseTest(unittest.TestCase):
+    """The parser must release what it opened and leave caller-owned streams open."""
+
+    def setUp(self):
+        self.parser = CheckpointCSVParser()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, name, text):
+        path = Path(self.tmpdir.name, name)
+        path.write_text(text, encoding='utf-8')
+        return path
+
+    def assert_binary_stream_kept_open(self, method, text):
+        data = text.encode('utf-8')
+        stream = io.BytesIO(data)
+        config = FirewallConfig()
+        getattr(self.parser, method)(stream, config)
+        gc.collect()
+        self.assertFalse(stream.closed, method)
+        stream.seek(0)
+        self.assertEqual(stream.read(), data, method)
+        return config
+
+    def assert_path_closed(self, method, text):
+        path = self._write(method + '.csv', text)
+        config = FirewallConfig()
+        # A leaked handle only warns from its finalizer, so record instead of raising
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            getattr(self.parser, method)(path, config)
+            gc.collect()
+        self.assertEqual([w for w in caught if issubclass(w.category, ResourceWarning)], [], method)
+        return config
+
+    def test_normal_file(self):
+        for method, text in GOOD.items():
+            with self.subTest(method=method):
+                self.assertEqual(_object_count(self.assert_binary_stream_kept_open(method, text)), 1)
+                self.assertEqual(_object_count(self.assert_path_closed(method, text)), 1)
+
+    def test_empty_file(self):
+        for method in GOOD:
+            with self.subTest(method=method):
+                self.assertEqual(_object_count(self.assert_binary_stream_kept_open(method, '')), 0)
+                self.assertEqual(_object_count(self.assert_path_closed(method, '')), 0)
+
+    def test_header_without_required_columns(self):
+        # These parsers return before reading any row when a column is missing
+        for method in ('parse_hosts', 'parse_networks', 'parse_address_ranges',
+                       'parse_tcp_services', 'parse_udp_services'):
+            with self.subTest(method=method):
+                text = "foo,bar\nx,y\n"
+                self.assertEqual(_object_count(self.assert_binary_stream_kept_open(method, text)), 0)
+                self.assertEqual(_object_count(self.assert_path_closed(method, text)), 0)
+
+    def test_header_without_group_columns(self):
+        for method in ('parse_groups', 'parse_service_groups'):
+            with self.subTest(method=method):
+                text = "foo,members.0\nx,y\n"
+                self.assertEqual(_object_count(self.assert_binary_stream_kept_open(method, text)), 0)
+                self.assertEqual(_object_count(self.assert_path_closed(method, text)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
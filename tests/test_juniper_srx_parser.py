@@ -0,0 +1,33 @@
+"""
+Policy line parsing checks for JuniperSrxParser.
+
+Run from the repository root: python -m unittest discover -s tests
+"""
+import unittest
+
+from parsers.juniper_srx_parser import JuniperSrxParser
+
+POLICY_PREFIX = "set security policies from-zone trust to-zone untrust policy WEB "
+
+
+class PolicyLineTest(unittest.TestCase):
+
+    def test_separate_then_permit_line_sets_allow(self):
+        content = (POLICY_PREFIX + "match source-address any\n"
+                   + POLICY_PREFIX + "match application junos-http\n"
+                   + POLICY_PREFIX + "then permit\n")
+        config = JuniperSrxParser().parse(content)
+        self.assertEqual(len(config.rules), 1)
+        rule = config.rules[0]
+        self.assertEqual(rule.name, 'WEB')
+        self.assertEqual(rule.action, 'allow')
+        self.assertEqual(set(rule.service), {'junos-http'})
+
+    def test_bare_match_line_does_not_raise(self):
+        config = JuniperSrxParser().parse(POLICY_PREFIX + "match\n")
+        self.assertEqual(len(config.rules), 1)
+        self.assertEqual(config.rules[0].action, 'deny')
+
+
+if __name__ == '__main__':
+    unittest.main()
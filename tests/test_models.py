@@ -0,0 +1,43 @@
+"""
+NamedSet behaviour checks.
+
+Run from the repository root: python -m unittest discover -s tests
+"""
+import unittest
+
+from models import Address, FirewallConfig, NamedSet
+from parsers.cisco_asa_parser import CiscoAsaParser
+
+
+class NamedSetRedefinitionTest(unittest.TestCase):
+    """A later definition under an existing name replaces the stored object."""
+
+    def test_add_replaces_same_name(self):
+        objects = NamedSet()
+        objects.add(Address(name='WEB', type='host', value1='10.0.0.10'))
+        objects.add(Address(name='WEB', type='host', value1='10.0.0.11'))
+        self.assertEqual(len(objects), 1)
+        self.assertEqual(objects.get('WEB').value1, '10.0.0.11')
+        self.assertEqual([a.value1 for a in objects], ['10.0.0.11'])
+
+    def test_update_replaces_same_name(self):
+        objects = NamedSet([Address(name='WEB', type='host', value1='10.0.0.10')])
+        objects.update([Address(name='WEB', type='host', value1='10.0.0.11'),
+                        Address(name='DB', type='host', value1='10.0.0.20'),
+                        Address(name='WEB', type='host', value1='10.0.0.12')])
+        self.assertEqual(len(objects), 2)
+        self.assertEqual(objects.get('WEB').value1, '10.0.0.12')
+        self.assertIs(next(a for a in objects if a.name == 'WEB'), objects.get('WEB'))
+
+    def test_asa_redefined_object_keeps_last_value(self):
+        content = ("object network WEB\n"
+                   " host 10.0.0.10\n"
+                   "object network WEB\n"
+                   " host 10.0.0.11\n")
+        config = CiscoAsaParser().parse(content=content)
+        self.assertIsInstance(config, FirewallConfig)
+        self.assertEqual([(a.name, a.value1) for a in config.addresses], [('WEB', '10.0.0.11')])
+
+
+if __name__ == '__main__':
+    unittest.main()